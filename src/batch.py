@@ -0,0 +1,145 @@
+"""Solve puzzle files in bulk across worker processes.
+
+Usage: python -m batch puzzles.txt -o solutions.txt --workers 8 --chunk-size 512
+
+Input has one puzzle per line ('.' or '0' for blanks; 81 characters for
+9x9, 256 or 625 for 16x16 and 25x25); blank lines and lines starting
+with '#' are skipped. Files in the other formats of formats.py (SDK
+grids, packed binary) are read through its memory-mapped reader, picked
+by extension or --format. Solutions are written in input order, one per
+line, and a puzzle with no solution is written as a line of dots. Only
+a bounded number of chunks is in flight at any time, so memory stays
+flat however long the file is. With --vectorized the 9x9 puzzles of
+each chunk go through the NumPy batch solver in vectorized.py (needs
+numpy) instead of one solve() call per puzzle; larger boards are still
+solved one by one.
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from itertools import islice
+
+from formats import FORMATS, read_puzzles as read_file, unflatten
+from puzzles import board_from_string, board_to_string
+from solver import STRATEGIES, solve
+
+
+def read_puzzles(lines):
+    """Yield (number, puzzle) for every puzzle in lines.
+
+    lines holds text lines (blank and '#' lines are skipped, number is the
+    line number) or flat boards, e.g. from formats.read_puzzles(), which
+    are passed through as they are.
+    """
+    for number, line in enumerate(lines, 1):
+        if not isinstance(line, str):
+            yield number, line
+            continue
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield number, line
+
+def solve_chunk(chunk, strategy="mrv", vectorized=False):
+    """Solve a list of (number, puzzle) pairs, puzzles being lines or flat boards, returning solution lines."""
+    boards = []
+    for number, puzzle in chunk:
+        try:
+            boards.append(board_from_string(puzzle) if isinstance(puzzle, str) else unflatten(puzzle))
+        except ValueError as e:
+            raise ValueError(f"line {number}: {e}") from None
+    solutions = [None] * len(boards)
+    # The NumPy solver only handles 9x9; larger boards are solved one by one
+    batched = [k for k, board in enumerate(boards) if len(board) == 9] if vectorized else []
+    if batched:
+        from vectorized import solve_batch
+
+        grids, solved = solve_batch([boards[k] for k in batched], strategy)
+        for k, grid, ok in zip(batched, grids, solved):
+            solutions[k] = grid.tolist() if ok else None
+    for k in set(range(len(boards))) - set(batched):
+        solutions[k] = solve(boards[k], strategy)
+    return [
+        board_to_string(solution) if solution else "." * len(board) ** 2
+        for board, solution in zip(boards, solutions)
+    ]
+
+def _chunks(puzzles, chunk_size):
+    while True:
+        chunk = list(islice(puzzles, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def run(lines, out, workers=None, chunk_size=256, strategy="mrv", vectorized=False):
+    """Solve every puzzle in lines (see read_puzzles) and write solutions to out in order.
+
+    Returns (solved, unsolved) counts. With workers == 1 everything runs in
+    this process; otherwise at most 2 * workers chunks are queued at once.
+    """
+    solved = unsolved = 0
+    chunks = _chunks(read_puzzles(lines), chunk_size)
+
+    def write(results):
+        nonlocal solved, unsolved
+        for line in results:
+            out.write(line + "\n")
+        unsolved += sum(1 for line in results if not line.strip("."))
+        solved += len(results)
+
+    if workers == 1:
+        for chunk in chunks:
+            write(solve_chunk(chunk, strategy, vectorized))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(workers) as pool:
+            pending = deque()
+            for chunk in chunks:
+                # Boards mapped from a file are memoryviews, which do not pickle
+                chunk = [(number, bytes(p) if isinstance(p, memoryview) else p) for number, p in chunk]
+                pending.append(pool.submit(solve_chunk, chunk, strategy, vectorized))
+                if len(pending) >= 2 * workers:
+                    write(pending.popleft().result())
+            while pending:
+                write(pending.popleft().result())
+    return solved - unsolved, unsolved
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m batch", description="Solve a file of Sudoku puzzle lines.")
+    parser.add_argument("input", help="puzzle file, or - for lines on stdin")
+    parser.add_argument("-f", "--format", choices=FORMATS, help="input format (default: from the extension, else line)")
+    parser.add_argument("--size", type=int, choices=(9, 16, 25), default=9, help="board size for sdk and packed input")
+    parser.add_argument("-o", "--output", default="-", help="solution file (default: stdout)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: CPU count, 1 = no pool)")
+    parser.add_argument("-c", "--chunk-size", type=int, default=256, help="puzzles per task sent to a worker")
+    parser.add_argument("-s", "--strategy", choices=sorted(STRATEGIES), default="mrv")
+    parser.add_argument("--vectorized", action="store_true", help="propagate the 9x9 puzzles of each chunk with NumPy, searching only boards it cannot finish")
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1 or (args.workers is not None and args.workers < 1):
+        parser.error("--workers and --chunk-size must be positive")
+
+    if args.format not in (None, "line") and args.input == "-":
+        parser.error("stdin is read as lines; pass a file for other formats")
+    dst = sys.stdout if args.output == "-" else open(args.output, "w")
+    start = time.perf_counter()
+    try:
+        src = sys.stdin if args.input == "-" else read_file(args.input, args.format, args.size)
+        solved, unsolved = run(src, dst, args.workers, args.chunk_size, args.strategy, args.vectorized)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if dst is not sys.stdout:
+            dst.close()
+    elapsed = time.perf_counter() - start
+    total = solved + unsolved
+    rate = total / elapsed if elapsed else 0.0
+    print(f"{total} puzzles ({unsolved} unsolved) in {elapsed:.2f}s, {rate:.0f} puzzles/s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
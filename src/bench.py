@@ -0,0 +1,160 @@
+"""Benchmark solver strategies on the bundled puzzle tiers.
+
+Usage: python -m bench -o results.json --baseline baseline.json --threshold 0.2
+
+For every tier in puzzles.BENCHMARK_TIERS (and every --puzzles file, in
+any format of formats.py) and every selected strategy this records the
+best wall time over --repeat runs, the search nodes visited and the
+peak traced memory. It also times importing each headless module in a
+fresh interpreter with python -X importtime and counts the modules the
+import pulls in. With --baseline it compares each metric against a saved
+results file and exits with status 1 if any grew by more than the
+threshold, so solver changes can be gated on the numbers; it also exits
+with 1 if a headless module loads pygame or numpy, baseline or not.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from formats import FORMATS, read_puzzles
+from puzzles import BENCHMARK_TIERS, board_from_string
+from solver import STRATEGIES, SearchStats, solve
+
+METRICS = ("seconds", "nodes", "peak_kib", "modules")
+# Timing differences below this many seconds are treated as noise
+TIME_FLOOR = 0.005
+# Modules that must import without the GUI dependencies, timed by bench_startup()
+HEADLESS_MODULES = ("solver", "puzzles", "logic", "main", "batch", "generator", "parallel", "server")
+GUI_DEPENDENCIES = ("pygame", "numpy")
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def bench_tier(puzzles, strategy, repeat=3):
+    """Return the metrics dict for solving every puzzle of a tier (lines or flat boards) with strategy."""
+    boards = [board_from_string(p) if isinstance(p, str) else p for p in puzzles]
+    stats = SearchStats()
+    for board in boards:
+        if solve(board, strategy, stats) is None:
+            raise ValueError(f"{strategy} found no solution for a benchmark puzzle")
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for board in boards:
+            solve(board, strategy)
+        best = min(best, time.perf_counter() - start)
+    # Memory is traced in its own pass, tracemalloc would skew the timings
+    tracemalloc.start()
+    for board in boards:
+        solve(board, strategy)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"seconds": best, "nodes": stats.nodes, "peak_kib": peak / 1024}
+
+def import_profile(module):
+    """Return (seconds, loaded) for importing module in a fresh interpreter.
+
+    Parsed from python -X importtime: seconds is the module's cumulative
+    import time and loaded the names of every module the import pulled in.
+    """
+    # Let the child cache bytecode, as an installed package would have it
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=SRC_DIR, env=env, capture_output=True, text=True, check=True)
+    seconds, loaded = 0.0, set()
+    for line in result.stderr.splitlines():
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        name = fields[2].strip()
+        loaded.add(name)
+        if name == module:
+            seconds = int(fields[1]) / 1e6
+    return seconds, loaded
+
+def bench_startup(module, repeat=3):
+    """Return the metrics dict for importing module, best of repeat after a warm-up run."""
+    _, loaded = import_profile(module)
+    best = min(import_profile(module)[0] for _ in range(repeat))
+    return {"seconds": best, "modules": len(loaded),
+            "gui": sorted(name for name in GUI_DEPENDENCIES if name in loaded)}
+
+def run(tiers, strategies, repeat=3, log=None, modules=HEADLESS_MODULES, corpora=None):
+    """Benchmark every strategy on every tier and time importing modules, returning a JSON-ready dict.
+
+    corpora maps extra tier names to their puzzles, e.g. boards read from a file.
+    """
+    results = {}
+    puzzles = {tier: BENCHMARK_TIERS[tier] for tier in tiers}
+    puzzles.update(corpora or {})
+    for tier in puzzles:
+        for strategy in strategies:
+            metrics = bench_tier(puzzles[tier], strategy, repeat)
+            results[f"{tier}/{strategy}"] = metrics
+            if log:
+                print(f"{tier:>18} {strategy:>6}  {metrics['seconds'] * 1000:9.2f} ms"
+                      f"  {metrics['nodes']:9d} nodes  {metrics['peak_kib']:8.1f} KiB", file=log)
+    for module in modules:
+        metrics = bench_startup(module, repeat)
+        results[f"startup/{module}"] = metrics
+        if log:
+            print(f"{'startup':>18} {module:>9}  {metrics['seconds'] * 1000:6.2f} ms"
+                  f"  {metrics['modules']:5d} modules  {' '.join(metrics['gui'])}", file=log)
+    return {"python": platform.python_version(), "platform": platform.platform(), "results": results}
+
+def compare(current, baseline, threshold=0.2):
+    """Return a message for every metric that regressed beyond threshold."""
+    regressions = []
+    for key, metrics in current["results"].items():
+        old = baseline["results"].get(key)
+        if old is None:
+            continue
+        for metric in METRICS:
+            if metric not in metrics or metric not in old:
+                continue
+            limit = old[metric] * (1 + threshold)
+            if metric == "seconds":
+                limit = max(limit, old[metric] + TIME_FLOOR)
+            if metrics[metric] > limit:
+                regressions.append(f"{key} {metric}: {old[metric]:.4g} -> {metrics[metric]:.4g}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench", description="Benchmark Sudoku solver strategies.")
+    parser.add_argument("-t", "--tiers", nargs="+", choices=list(BENCHMARK_TIERS), default=list(BENCHMARK_TIERS))
+    parser.add_argument("-s", "--strategies", nargs="+", choices=sorted(STRATEGIES), default=["mrv", "dlx"],
+                        help="naive is left out by default, it takes minutes on the anti-backtracking tier")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="timing runs per tier, the best one is kept")
+    parser.add_argument("-o", "--output", help="write results as JSON to this file")
+    parser.add_argument("-b", "--baseline", help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative growth per metric (default 0.2)")
+    parser.add_argument("-p", "--puzzles", nargs="+", default=[], help="also benchmark these puzzle files, each as its own tier")
+    parser.add_argument("-f", "--format", choices=FORMATS, help="format of the --puzzles files (default: from the extension)")
+    parser.add_argument("--size", type=int, choices=(9, 16, 25), default=9, help="board size for sdk and packed files")
+    parser.add_argument("--no-startup", action="store_true", help="skip the import time checks")
+    args = parser.parse_args(argv)
+
+    modules = () if args.no_startup else HEADLESS_MODULES
+    corpora = {path: list(read_puzzles(path, args.format, args.size)) for path in args.puzzles}
+    current = run(args.tiers, args.strategies, args.repeat, log=sys.stderr, modules=modules, corpora=corpora)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+    regressions = [f"{key} imports {', '.join(metrics['gui'])}"
+                   for key, metrics in current["results"].items() if metrics.get("gui")]
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions += compare(current, baseline, args.threshold)
+    for message in regressions:
+        print(f"regression: {message}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""Memoize solutions under Sudoku's symmetry group.
+
+canonical_form() maps a board to a representative of its equivalence class
+under transposition, band/stack swaps, row/column swaps inside a band or
+stack and digit relabeling. SolutionCache looks that form up in a bounded
+LRU (and optionally an sqlite file), solving it only on a miss, and maps
+the stored solution back to the caller's orientation.
+"""
+import sqlite3
+from collections import OrderedDict
+from itertools import groupby, islice, permutations, product
+
+from puzzles import board_from_string, board_to_string
+from solver import solve
+
+# Most candidate transforms canonical_form() compares; past it the form is
+# still a valid key, just not guaranteed identical for every symmetric variant
+CANONICAL_LIMIT = 2000
+
+
+def _tied_orders(keys):
+    """Every ordering of range(len(keys)) sorted by keys, with equal keys in any order."""
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    groups = [list(permutations(g)) for _, g in groupby(order, key=keys.__getitem__)]
+    return [sum(combo, ()) for combo in product(*groups)]
+
+def _orders(grid):
+    """Row orders for grid whose band and row sort keys ignore column moves and digit labels."""
+    col_counts = [sum(1 for row in grid if row[j]) for j in range(9)]
+    keys = []
+    for row in grid:
+        keys.append((
+            sum(1 for num in row if num),
+            tuple(sorted(col_counts[j] for j, num in enumerate(row) if num)),
+            tuple(sorted(sum(1 for num in row[3 * s:3 * s + 3] if num) for s in range(3))),
+        ))
+    band_keys = [tuple(sorted(keys[3 * b:3 * b + 3])) for b in range(3)]
+    within = [_tied_orders(keys[3 * b:3 * b + 3]) for b in range(3)]
+    orders = []
+    for bands in _tied_orders(band_keys):
+        for combo in product(*(within[b] for b in bands)):
+            orders.append([3 * b + k for b, rows in zip(bands, combo) for k in rows])
+    return orders
+
+def _transpose(board):
+    return [list(col) for col in zip(*board)]
+
+def _relabel(grid, rows, cols):
+    """Read grid in rows x cols order with digits renamed by first appearance.
+
+    Returns the 81 cell values as a list and the digit map used.
+    """
+    mapping = [0] * 10
+    label = 0
+    out = []
+    for r in rows:
+        source = grid[r]
+        for c in cols:
+            num = source[c]
+            if num and not mapping[num]:
+                label += 1
+                mapping[num] = label
+            out.append(mapping[num])
+    return out, mapping
+
+def canonical_form(board, limit=CANONICAL_LIMIT):
+    """Return (key, transform) for board.
+
+    key is the smallest relabeled 81-character string over the transforms
+    that sort bands, stacks, rows and columns by clue-count invariants
+    (ties are tried in every order, up to limit candidates). transform is
+    what map_solution() needs to carry a solution of the key back.
+    Because key is always a transformed copy of board, equal keys mean
+    equivalent boards even when the limit cuts the search short.
+    Raises ValueError for anything but a 9x9 board.
+    """
+    if len(board) != 9 or any(len(row) != 9 for row in board):
+        raise ValueError("the solution cache only handles 9x9 boards")
+    best = None
+    for transposed in (False, True):
+        grid = _transpose(board) if transposed else board
+        row_orders = _orders(grid)
+        col_orders = _orders(_transpose(grid))
+        for rows, cols in islice(product(row_orders, col_orders), limit):
+            form, mapping = _relabel(grid, rows, cols)
+            if best is None or form < best[0]:
+                best = (form, (transposed, rows, cols, mapping))
+    form, (transposed, rows, cols, mapping) = best
+    # Digits missing from the givens take the remaining labels in order
+    label = max(mapping)
+    for num in range(1, 10):
+        if not mapping[num]:
+            label += 1
+            mapping[num] = label
+    key = "".join(str(num) if num else "." for num in form)
+    return key, (transposed, rows, cols, mapping)
+
+def map_solution(solution, transform):
+    """Carry a solution of the canonical board back to the original board's orientation."""
+    transposed, rows, cols, mapping = transform
+    unlabel = [0] * 10
+    for num in range(1, 10):
+        unlabel[mapping[num]] = num
+    grid = [[0] * 9 for _ in range(9)]
+    for r, source_row in enumerate(rows):
+        for c, source_col in enumerate(cols):
+            grid[source_row][source_col] = unlabel[solution[r][c]]
+    return _transpose(grid) if transposed else grid
+
+
+class SolutionCache:
+    """Bounded LRU of solutions keyed by canonical form, optionally persisted to sqlite.
+
+    Use solve() in place of solver.solve(). hits, misses and disk_hits
+    count lookups; stats() returns them as a dict.
+    """
+
+    def __init__(self, maxsize=4096, path=None, strategy="mrv"):
+        self.maxsize = maxsize
+        self.strategy = strategy
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._lru = OrderedDict()
+        self._db = None
+        self._unsaved = 0
+        if path is not None:
+            self._db = sqlite3.connect(path)
+            self._db.execute("CREATE TABLE IF NOT EXISTS solutions (key TEXT PRIMARY KEY, solution TEXT NOT NULL)")
+
+    def solve(self, board):
+        """Return a solved copy of board, or None if it has no solution.
+
+        Only 9x9 boards are cached; anything else raises ValueError.
+        """
+        key, transform = canonical_form(board)
+        solution = self._lookup(key)
+        if solution is None:
+            self.misses += 1
+            solution = solve(board_from_string(key), self.strategy)
+            solution = board_to_string(solution) if solution else ""
+            self._store(key, solution)
+        if not solution:
+            return None
+        return map_solution(board_from_string(solution), transform)
+
+    def _lookup(self, key):
+        if key in self._lru:
+            self._lru.move_to_end(key)
+            self.hits += 1
+            return self._lru[key]
+        if self._db is not None:
+            row = self._db.execute("SELECT solution FROM solutions WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self.hits += 1
+                self.disk_hits += 1
+                self._remember(key, row[0])
+                return row[0]
+        return None
+
+    def _remember(self, key, solution):
+        self._lru[key] = solution
+        if len(self._lru) > self.maxsize:
+            self._lru.popitem(last=False)
+
+    def _store(self, key, solution):
+        self._remember(key, solution)
+        if self._db is not None:
+            self._db.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?)", (key, solution))
+            self._unsaved += 1
+            if self._unsaved >= 256:
+                self.flush()
+
+    def flush(self):
+        """Commit pending writes to the on-disk store."""
+        if self._db is not None and self._unsaved:
+            self._db.commit()
+            self._unsaved = 0
+
+    def close(self):
+        if self._db is not None:
+            self.flush()
+            self._db.close()
+            self._db = None
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "size": len(self._lru),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
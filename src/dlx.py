@@ -0,0 +1,185 @@
+"""Knuth's Algorithm X with Dancing Links, as an exact-cover Sudoku backend."""
+from math import isqrt
+
+
+class DancingLinks:
+    """Toroidal doubly linked exact-cover matrix stored in flat parallel arrays.
+
+    Node 0 is the root, nodes 1..n_cols are the column headers and every
+    node after that belongs to a row. left/right/up/down hold neighbour
+    indices, column holds each node's header and row_id the id passed to
+    add_row, so the whole matrix is a handful of int lists.
+    """
+    __slots__ = ("left", "right", "up", "down", "column", "row_id", "size")
+
+    def __init__(self, n_cols):
+        headers = range(n_cols + 1)
+        self.left = [c - 1 for c in headers]
+        self.right = [c + 1 for c in headers]
+        self.left[0] = n_cols
+        self.right[n_cols] = 0
+        self.up = list(headers)
+        self.down = list(headers)
+        self.column = list(headers)
+        self.row_id = [-1] * (n_cols + 1)
+        self.size = [0] * (n_cols + 1)
+
+    def add_row(self, row_id, cols):
+        """Append a row with a 1 in each of cols (1-based column numbers)."""
+        left, right, up, down = self.left, self.right, self.up, self.down
+        first = len(left)
+        for k, c in enumerate(cols):
+            node = first + k
+            left.append(node - 1 if k else first + len(cols) - 1)
+            right.append(node + 1 if k < len(cols) - 1 else first)
+            up.append(up[c])
+            down.append(c)
+            down[up[c]] = node
+            up[c] = node
+            self.column.append(c)
+            self.row_id.append(row_id)
+            self.size[c] += 1
+
+    def cover(self, c):
+        left, right, up, down, column, size = (
+            self.left, self.right, self.up, self.down, self.column, self.size)
+        right[left[c]] = right[c]
+        left[right[c]] = left[c]
+        i = down[c]
+        while i != c:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                size[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def uncover(self, c):
+        left, right, up, down, column, size = (
+            self.left, self.right, self.up, self.down, self.column, self.size)
+        i = up[c]
+        while i != c:
+            j = left[i]
+            while j != i:
+                size[column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[c]] = c
+        left[right[c]] = c
+
+    def solutions(self, stats=None):
+        """Yield every exact cover as a list of row ids.
+
+        The search is iterative, always branching on the column with the
+        fewest remaining rows, so depth is not limited by the recursion limit.
+        stats, if given, is a solver.SearchStats.
+        """
+        right, left, down, column, size = (
+            self.right, self.left, self.down, self.column, self.size)
+        chosen = []
+        while True:
+            # Descend: pick the smallest column and try its first row
+            descend = right[0] != 0
+            if descend:
+                if stats is not None:
+                    stats.enter(len(chosen))
+                c = right[0]
+                best = size[c]
+                j = right[c]
+                while j != 0 and best > 1:
+                    if size[j] < best:
+                        c, best = j, size[j]
+                    j = right[j]
+                if stats is not None:
+                    stats.branch(best)
+                self.cover(c)
+                node = down[c]
+                if node == c:
+                    self.uncover(c)
+                    descend = False
+                else:
+                    chosen.append(node)
+                    j = right[node]
+                    while j != node:
+                        self.cover(column[j])
+                        j = right[j]
+                    continue
+            else:
+                yield [self.row_id[node] for node in chosen]
+            # Backtrack: move the deepest choice to its next row
+            while chosen:
+                node = chosen.pop()
+                j = left[node]
+                while j != node:
+                    self.uncover(column[j])
+                    j = left[j]
+                c = column[node]
+                node = down[node]
+                if stats is not None:
+                    stats.backtrack(len(chosen))
+                if node != c:
+                    chosen.append(node)
+                    j = right[node]
+                    while j != node:
+                        self.cover(column[j])
+                        j = right[j]
+                    break
+                self.uncover(c)
+            else:
+                return
+
+
+def build_matrix(board):
+    """Exact-cover matrix for board, with rows only for digits its givens allow.
+
+    Row ids encode cell * size + (digit - 1). Clashing givens simply leave
+    the matrix without any cover.
+    """
+    size = len(board)
+    box = isqrt(size)
+    cells = [num for row in board for num in row]
+    rows = [0] * size
+    cols = [0] * size
+    boxes = [0] * size
+    for i, num in enumerate(cells):
+        if num:
+            r, c = divmod(i, size)
+            bit = 1 << num
+            rows[r] |= bit
+            cols[c] |= bit
+            boxes[r // box * box + c // box] |= bit
+    area = size * size
+    matrix = DancingLinks(4 * area)
+    for i, num in enumerate(cells):
+        r, c = divmod(i, size)
+        b = r // box * box + c // box
+        if num:
+            digits = (num,)
+        else:
+            used = rows[r] | cols[c] | boxes[b]
+            digits = [d for d in range(1, size + 1) if not used >> d & 1]
+        for d in digits:
+            matrix.add_row(i * size + d - 1, (
+                1 + i,
+                1 + area + r * size + d - 1,
+                1 + 2 * area + c * size + d - 1,
+                1 + 3 * area + b * size + d - 1,
+            ))
+    return matrix
+
+def iter_solutions(board, stats=None):
+    """Yield every solution of board as a new list of lists, lazily."""
+    size = len(board)
+    for row_ids in build_matrix(board).solutions(stats):
+        solution = [[0] * size for _ in range(size)]
+        for row_id in row_ids:
+            i, d = divmod(row_id, size)
+            solution[i // size][i % size] = d + 1
+        yield solution
+
+def solve(board, stats=None):
+    """Return the first solution of board, or None if it has none."""
+    return next(iter_solutions(board, stats), None)
@@ -0,0 +1,231 @@
+"""Puzzle file formats: streaming readers over mmap, and writers.
+
+    line    one puzzle per line, 81, 256 or 625 characters ('.' or '0'
+            for blanks, letters above 9); blank and '#' lines are skipped
+    sdk     grids of size rows by size cells, optionally spaced and ruled
+            with | - +, one after another; '#' lines are comments
+    packed  size * size bytes per puzzle, one cell value per byte
+    nibble  41 bytes per 9x9 puzzle, two cells per byte, high nibble first
+
+Puzzles come back as flat boards (size * size cell values, see
+solver.board_cells), which solve(), count_solutions() and Grid.load()
+take as they are. Files are memory-mapped and read lazily, so a corpus
+of any length costs no more memory than the puzzles still referenced:
+packed puzzles are memoryview slices of the mapping itself, with no
+copy, and a text puzzle costs its line slice plus one bytes.translate
+(no str decoding or per-cell Python objects).
+"""
+import mmap
+import os
+from array import array
+from math import isqrt
+
+from puzzles import DIGITS
+from solver import board_cells
+
+FORMATS = ("line", "sdk", "packed", "nibble")
+# File extensions read_puzzles() and PuzzleFile recognise; anything else is "line"
+EXTENSIONS = {".txt": "line", ".sdk": "sdk", ".bin": "packed", ".nib": "nibble"}
+NIBBLE_BYTES = 41
+LINE_SIZES = {81: 9, 256: 16, 625: 25}
+
+# Text character -> cell value, 255 for characters that are not cells
+_VALUES = bytearray(b"\xff" * 256)
+_VALUES[ord(".")] = _VALUES[ord("0")] = 0
+for _num, _ch in enumerate(DIGITS, 1):
+    _VALUES[ord(_ch)] = _VALUES[ord(_ch.lower())] = _num
+_VALUES = bytes(_VALUES)
+# Cell value -> text character
+_TEXT = ("." + DIGITS).encode().ljust(256, b"?")
+_HIGH = bytes(b >> 4 for b in range(256))
+_LOW = bytes(b & 15 for b in range(256))
+# Bytes whose two nibbles are both cell values
+_NIBBLE_CELLS = bytes(b for b in range(256) if b >> 4 <= 9 and b & 15 <= 9)
+# Ruling and spacing in sdk grids
+_RULES = b" \t\r\n|+-"
+# Binary files are validated this many bytes at a time while iterating
+BLOCK_BYTES = 1 << 20
+
+
+def format_for(path):
+    """Guess a file's format from its extension (see EXTENSIONS)."""
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower(), "line")
+
+def unflatten(board):
+    """Return a flat board as a list of rows."""
+    size = isqrt(len(board))
+    return [list(board[r * size:(r + 1) * size]) for r in range(size)]
+
+def encode(board, fmt="line"):
+    """Return one board (list of rows or flat) as the bytes of a fmt record."""
+    cells = board_cells(board)
+    size = isqrt(len(cells))
+    if fmt == "line":
+        return cells.translate(_TEXT) + b"\n"
+    if fmt == "sdk":
+        text = cells.translate(_TEXT)
+        return b"".join(text[r * size:(r + 1) * size] + b"\n" for r in range(size)) + b"\n"
+    if fmt == "packed":
+        return bytes(cells)
+    if fmt == "nibble":
+        if size != 9:
+            raise ValueError("the nibble format only holds 9x9 boards")
+        cells.append(0)
+        return bytes(high << 4 | low for high, low in zip(cells[0::2], cells[1::2]))
+    raise ValueError(f"unknown format {fmt!r}")
+
+def write_puzzles(out, boards, fmt="line"):
+    """Write boards to the binary file out in fmt, returning how many were written."""
+    written = 0
+    for board in boards:
+        out.write(encode(board, fmt))
+        written += 1
+    return written
+
+def read_puzzles(path, fmt=None, size=9):
+    """Yield every puzzle in the file at path as a flat board, lazily.
+
+    fmt defaults to format_for(path); size is the board size for the sdk
+    and packed formats (line puzzles carry their own). Raises ValueError
+    naming the line or record of the first malformed puzzle.
+    """
+    return iter(PuzzleFile(path, fmt, size))
+
+
+class PuzzleFile:
+    """A memory-mapped puzzle file: iterate it, or take len() and puzzles by index.
+
+    Indexing packed and nibble files is O(1); the first len() or index on
+    a text file scans it once for the offset of every puzzle.
+    """
+
+    __slots__ = ("path", "format", "size", "_map", "_starts")
+
+    def __init__(self, path, fmt=None, size=9):
+        self.path = path
+        self.format = fmt or format_for(path)
+        if self.format not in FORMATS:
+            raise ValueError(f"unknown format {self.format!r}")
+        if self.format == "nibble" and size != 9:
+            raise ValueError("the nibble format only holds 9x9 boards")
+        self.size = size
+        self._starts = None
+        with open(path, "rb") as f:
+            # mmap refuses empty files
+            empty = not os.fstat(f.fileno()).st_size
+            self._map = b"" if empty else mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        record = self._record_size()
+        if record and len(self._map) % record:
+            raise ValueError(f"{path}: {len(self._map)} bytes is not a whole number of {record}-byte puzzles")
+
+    def _record_size(self):
+        if self.format == "packed":
+            return self.size * self.size
+        if self.format == "nibble":
+            return NIBBLE_BYTES
+        return 0
+
+    def __iter__(self):
+        record = self._record_size()
+        if not record:
+            return (board for _, board in self._scan())
+        return self._records(record)
+
+    def __len__(self):
+        record = self._record_size()
+        return len(self._map) // record if record else len(self._offsets())
+
+    def __getitem__(self, k):
+        count = len(self)
+        if not -count <= k < count:
+            raise IndexError(f"puzzle {k} out of range, {self.path} has {count}")
+        k %= count
+        if self._record_size():
+            return self._decode(memoryview(self._map), k)
+        return next(self._scan(self._starts[k]))[1]
+
+    def close(self):
+        """Unmap the file; packed puzzles still referenced from it must be dropped first."""
+        if self._map:
+            self._map.close()
+
+    def _records(self, record):
+        view = memoryview(self._map)
+        per_block = max(1, BLOCK_BYTES // record)
+        count = len(view) // record
+        for first in range(0, count, per_block):
+            last = min(count, first + per_block)
+            # One C-level pass over the block instead of a check per puzzle
+            if self._map[first * record:last * record].translate(None, self._cells()):
+                for k in range(first, last):
+                    self._decode(view, k)
+            for k in range(first, last):
+                yield self._decode(view, k, checked=True)
+
+    def _cells(self):
+        return _NIBBLE_CELLS if self.format == "nibble" else bytes(range(self.size + 1))
+
+    def _decode(self, view, k, checked=False):
+        record = self._record_size()
+        view = view[k * record:(k + 1) * record]
+        if not checked and view.tobytes().translate(None, self._cells()):
+            raise ValueError(f"{self.path}: puzzle {k} has a cell above {self.size}")
+        if self.format == "packed":
+            return view
+        raw = view.tobytes()
+        cells = bytearray(2 * record)
+        cells[0::2] = raw.translate(_HIGH)
+        cells[1::2] = raw.translate(_LOW)
+        del cells[81:]
+        return cells
+
+    def _offsets(self):
+        if self._starts is None:
+            self._starts = array("Q", (start for start, _ in self._scan()))
+        return self._starts
+
+    def _scan(self, pos=0):
+        """Yield (offset, board) for the text puzzles from byte offset pos on."""
+        data = self._map
+        end = len(data)
+        area = self.size * self.size
+        cells = bytearray()
+        first = pos
+        while pos < end:
+            nl = data.find(b"\n", pos)
+            if nl < 0:
+                nl = end
+            raw = data[pos:nl]
+            line_start, pos = pos, nl + 1
+            if raw.lstrip().startswith(b"#"):
+                continue
+            if self.format == "line":
+                raw = raw.strip()
+                if raw:
+                    yield line_start, self._check(raw.translate(_VALUES), LINE_SIZES.get(len(raw)), line_start)
+                continue
+            row = raw.translate(_VALUES, _RULES)
+            if not row:
+                continue
+            if len(row) != self.size:
+                raise ValueError(f"{self._where(line_start)}: expected {self.size} cells, got {len(row)}")
+            if not cells:
+                first = line_start
+            cells += row
+            if len(cells) == area:
+                yield first, self._check(bytes(cells), self.size, first)
+                cells = bytearray()
+        if cells:
+            raise ValueError(f"{self._where(first)}: grid has only {len(cells) // self.size} of {self.size} rows")
+
+    def _check(self, cells, size, offset):
+        if size is None:
+            raise ValueError(f"{self._where(offset)}: expected 81, 256 or 625 characters, got {len(cells)}")
+        if max(cells) > size:
+            raise ValueError(f"{self._where(offset)}: invalid character")
+        return cells
+
+    def _where(self, offset):
+        # Only needed for error messages, so the lines are counted here
+        line = self._map[:offset].count(b"\n") + 1
+        return f"{self.path} line {line}"
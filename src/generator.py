@@ -0,0 +1,175 @@
+"""Generate unique-solution puzzles in bulk, graded by the techniques they need.
+
+Usage: python -m generator -n 10000 -o corpus.txt --seed 7 --workers 8
+
+Each puzzle starts from a random full grid (random digits in the
+independent diagonal boxes, completed by the MRV solver); its clues are
+then cleared in random order, keeping a removal only if the puzzle stays
+uniquely solvable (see solver.remove_given), and the result is graded by
+the techniques logic.py needs to solve it. Puzzle k of a run is built
+from its own Random(f"{seed}:{k}"), so the output is the same for any
+number of workers or chunk size. Lines are written in order as chunks
+finish, so a long run can be stopped at any point with a usable file.
+With --format the corpus is written as SDK grids or packed binary
+instead of lines (see formats.py).
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter, deque
+from itertools import count, islice
+from math import isqrt
+
+from formats import FORMATS, encode
+from puzzles import board_from_string, board_to_string
+from logic import hardest_technique, solve_logically
+from solver import Grid, remove_given, solve
+
+# From easiest to hardest; see grade()
+DIFFICULTIES = ("easy", "medium", "hard", "expert", "extreme")
+GRADES = {
+    "naked single": "easy",
+    "hidden single": "medium",
+    "naked pair": "hard", "hidden pair": "hard", "naked triple": "hard", "hidden triple": "hard",
+    "pointing": "hard", "box-line reduction": "hard",
+    "x-wing": "expert", "swordfish": "expert",
+    "search": "extreme",
+}
+# Default clue floor per board size; on 16x16 and 25x25 each uniqueness
+# check near the minimum takes seconds, so removal stops well before it
+MIN_CLUES = {9: 0, 16: 110, 25: 340}
+
+
+def random_solution(rng, size=9):
+    """Return a random complete board of the given size."""
+    box = isqrt(size)
+    board = [[0] * size for _ in range(size)]
+    # Boxes on the diagonal share no row or column, so any digits fit
+    for b in range(box):
+        digits = rng.sample(range(1, size + 1), size)
+        for k, num in enumerate(digits):
+            board[b * box + k // box][b * box + k % box] = num
+    return solve(board)
+
+def make_puzzle(rng, size=9, min_clues=None):
+    """Return (puzzle, solution) with as few clues as rng's removal order allows.
+
+    Removal stops early once only min_clues clues are left (MIN_CLUES[size]
+    by default).
+    """
+    if min_clues is None:
+        min_clues = MIN_CLUES[size]
+    solution = random_solution(rng, size)
+    grid = Grid.load(solution)
+    order = list(range(size * size))
+    rng.shuffle(order)
+    clues = len(order)
+    for i in order:
+        if clues <= min_clues:
+            break
+        if remove_given(grid, i):
+            clues -= 1
+    return grid.to_board(), solution
+
+def grade(puzzle):
+    """Grade a unique-solution puzzle by the hardest technique the logical solver needed.
+
+    "easy" needs only naked singles, "medium" hidden singles, "hard"
+    subsets or locked candidates, "expert" X-wings or swordfish and
+    "extreme" stalls every technique in logic.py, so it needs search.
+    """
+    _, trace = solve_logically(puzzle)
+    return GRADES[hardest_technique(trace) or "naked single"]
+
+def generate_chunk(indices, seed, size=9, min_clues=None):
+    """Build puzzles number indices of the run seeded with seed, as (line, grade) pairs."""
+    results = []
+    for k in indices:
+        puzzle, _ = make_puzzle(random.Random(f"{seed}:{k}"), size, min_clues)
+        results.append((board_to_string(puzzle), grade(puzzle)))
+    return results
+
+def _chunks(numbers, chunk_size):
+    while True:
+        chunk = list(islice(numbers, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def run(out, total, seed=0, workers=None, chunk_size=16, size=9, min_clues=None, difficulty=None, fmt=None):
+    """Write total puzzles to out in order, one line each, returning a Counter of their grades.
+
+    With fmt set, out is a binary file and puzzles are written as fmt
+    records (see formats.encode) instead.
+
+    With difficulty set, puzzles of other grades are skipped (but still use
+    up their index, so the kept ones do not depend on chunking). With
+    workers == 1 everything runs in this process; otherwise at most
+    2 * workers chunks are queued at once.
+    """
+    grades = Counter()
+    chunks = _chunks(count(), chunk_size)
+
+    def write(results):
+        for line, level in results:
+            if grades.total() < total and difficulty in (None, level):
+                out.write(encode(board_from_string(line), fmt) if fmt else line + "\n")
+                grades[level] += 1
+        out.flush()
+        return grades.total() >= total
+
+    if workers == 1:
+        for chunk in chunks:
+            if write(generate_chunk(chunk, seed, size, min_clues)):
+                break
+        return grades
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(generate_chunk, chunk, seed, size, min_clues))
+            if len(pending) >= 2 * workers and write(pending.popleft().result()):
+                break
+        for future in pending:
+            future.cancel()
+    return grades
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m generator", description="Generate unique-solution Sudoku puzzles.")
+    parser.add_argument("-n", "--count", type=int, default=100, help="puzzles to write")
+    parser.add_argument("-o", "--output", default="-", help="puzzle file (default: stdout)")
+    parser.add_argument("--seed", type=int, default=0, help="run seed; the same seed gives the same puzzles")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: CPU count, 1 = no pool)")
+    parser.add_argument("-c", "--chunk-size", type=int, default=16, help="puzzles per task sent to a worker")
+    parser.add_argument("--size", type=int, choices=(9, 16, 25), default=9)
+    parser.add_argument("--min-clues", type=int, default=None, help="stop removing clues at this many (default: 0 for 9x9, more for larger sizes)")
+    parser.add_argument("-d", "--difficulty", choices=DIFFICULTIES, help="only keep puzzles of this grade")
+    parser.add_argument("-f", "--format", choices=FORMATS, default="line", help="output format (nibble is 9x9 only)")
+    args = parser.parse_args(argv)
+    if args.count < 0 or args.chunk_size < 1 or (args.workers is not None and args.workers < 1):
+        parser.error("--count, --workers and --chunk-size must be positive")
+    if args.format == "nibble" and args.size != 9:
+        parser.error("the nibble format only holds 9x9 boards")
+
+    dst = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    start = time.perf_counter()
+    try:
+        grades = run(dst, args.count, args.seed, args.workers, args.chunk_size,
+                     args.size, args.min_clues, args.difficulty, args.format)
+    finally:
+        if dst is not sys.stdout.buffer:
+            dst.close()
+    elapsed = time.perf_counter() - start
+    total = grades.total()
+    rate = total / elapsed if elapsed else 0.0
+    breakdown = ", ".join(f"{grades[level]} {level}" for level in DIFFICULTIES)
+    print(f"{total} puzzles ({breakdown}) in {elapsed:.2f}s, {rate:.0f} puzzles/s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
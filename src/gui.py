@@ -0,0 +1,401 @@
+"""pygame window: board editing, animated solving and the logical replay (started by main.py)."""
+import functools
+import pygame
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from math import isqrt
+from puzzles import DIGITS, get_example_board
+from logic import CandidateIndex, Step, iter_logic_steps
+from solver import count_solutions, iter_steps
+
+# Window dimensions; the board fills the top WIDTH x WIDTH square
+WIDTH = 540
+HEIGHT = 660
+
+# Colors
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+PLACE_COLOR = (0, 0, 255)
+SELECTED_COLOR = (255, 0, 0)
+CONFLICT_COLOR = (255, 200, 200)
+PENCIL_COLOR = (130, 130, 130)
+THIN_LINE = 1
+THICK_LINE = 3
+
+# Button dimensions and colors
+BUTTON_HEIGHT = 60
+BUTTON_COLOR = (50, 150, 255)
+BUTTON_HOVER_COLOR = (30, 120, 220)
+BUTTON_TEXT_COLOR = (255, 255, 255)
+BUTTONS = [("Solve", 270), ("Customize", 90), ("Reset", 450)]
+
+# Animation speed: solver steps per second, None = as many as fit in a frame
+FPS = 60
+SOLVE_SPEEDS = [5, 25, 100, 500, 2500, None]
+DEFAULT_SPEED = 1
+FRAME_BUDGET = 0.012
+
+# count_solutions() results (limit 2) as shown in the caption for custom boards
+SOLUTION_LABELS = ["no solution", "unique solution", "multiple solutions"]
+
+def run(size=9, puzzle=None):
+    """Open the window for a size x size board and run until it is closed.
+
+    puzzle, a list of rows, replaces the example board (also for Reset).
+    """
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Sudoku Solver")
+    clock = pygame.time.Clock()
+    renderer = Renderer(screen, size)
+    cell_size = renderer.cell_size
+    # Plain backtracking is only watchable on 9x9; larger boards replay the MRV search
+    strategy = "naive" if size == 9 else "mrv"
+    solve_button = renderer.buttons["Solve"]
+    customize_button = renderer.buttons["Customize"]
+    reset_button = renderer.buttons["Reset"]
+
+    board = [row[:] for row in puzzle] if puzzle else get_example_board(size)
+    temp_board = [row[:] for row in board]
+    original_board = [row[:] for row in board]
+    givens = None
+    # Live digit counts per unit for temp_board: conflicts, pencil marks and hints
+    index = CandidateIndex(temp_board)
+    pencil = False
+    message = None
+
+    running = True
+    solving = False
+    selected = None
+    steps = None
+    paused = False
+    speed = DEFAULT_SPEED
+    step_credit = 0.0
+    caption = "Sudoku Solver"
+    last_step = None
+    # Custom boards are counted in a worker process and only solved if unique
+    checker = ProcessPoolExecutor(max_workers=1)
+    customized = False
+    check = None
+    solutions = None
+
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+
+            if event.type == pygame.WINDOWEXPOSED:
+                renderer.invalidate()
+
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                mouse_x, mouse_y = pygame.mouse.get_pos()
+                
+                if solve_button.collidepoint(mouse_x, mouse_y) and not solving:
+                    if customized and solutions != 1:
+                        continue
+                    solving = True
+                    board = [row[:] for row in temp_board]
+                    givens = temp_board
+                    steps = iter_steps(board, strategy)
+                    paused = False
+                    last_step = None
+
+                elif customize_button.collidepoint(mouse_x, mouse_y):
+                    solving = cancel_solve(steps)
+                    temp_board = [[0] * size for _ in range(size)]
+                    index = CandidateIndex(temp_board)
+                    message = None
+                    customized = True
+                    check = check_board(checker, check, temp_board)
+                    solutions = None
+
+                elif reset_button.collidepoint(mouse_x, mouse_y):
+                    solving = cancel_solve(steps)
+                    temp_board = [row[:] for row in original_board]
+                    index = CandidateIndex(temp_board)
+                    message = None
+                    selected = None
+                    customized = False
+
+                else:
+                    col = mouse_x // cell_size
+                    row = mouse_y // cell_size
+                    if 0 <= row < size and 0 <= col < size:
+                        selected = tuple([row, col])
+                    else:
+                        selected = None
+
+            if event.type == pygame.KEYDOWN:
+                if selected and not solving:
+                    row, col = selected
+                    old = temp_board[row][col]
+                    if event.unicode and event.unicode.upper() in DIGITS[:size]:
+                        num = DIGITS.index(event.unicode.upper()) + 1
+                        temp_board[row][col] = num
+                    elif event.key == pygame.K_BACKSPACE:
+                        temp_board[row][col] = 0
+                    if temp_board[row][col] != old:
+                        index.set(row, col, temp_board[row][col])
+                        message = None
+                        if customized:
+                            check = check_board(checker, check, temp_board)
+                            solutions = None
+
+                # Tab toggles pencil marks, ? fills in the next logical deduction
+                if event.key == pygame.K_TAB and not solving:
+                    pencil = not pencil
+                elif event.unicode in ("?", "/") and not solving:
+                    step = index.hint()
+                    if step is None:
+                        message = "hint: fix the conflicts first" if index.clashes else "hint: no logical step found"
+                    else:
+                        (row, col), num = step.placed[0]
+                        temp_board[row][col] = num
+                        index.set(row, col, num)
+                        selected = (row, col)
+                        message = "hint: " + describe_step(step)
+                        if customized:
+                            check = check_board(checker, check, temp_board)
+                            solutions = None
+
+                # Space backtracks, Enter replays the logical solver's deductions
+                if event.key in (pygame.K_SPACE, pygame.K_RETURN) and not solving:
+                    if customized and solutions != 1:
+                        continue
+                    solving = True
+                    board = [row[:] for row in temp_board]
+                    givens = temp_board
+                    if event.key == pygame.K_RETURN:
+                        steps = iter_logic_steps(board)
+                    else:
+                        steps = iter_steps(board, strategy)
+                    paused = False
+                    last_step = None
+                elif event.key == pygame.K_SPACE:
+                    paused = not paused
+                elif event.key == pygame.K_ESCAPE and solving:
+                    solving = cancel_solve(steps)
+                elif event.key in (pygame.K_UP, pygame.K_RIGHT):
+                    speed = min(speed + 1, len(SOLVE_SPEEDS) - 1)
+                elif event.key in (pygame.K_DOWN, pygame.K_LEFT):
+                    speed = max(speed - 1, 0)
+
+        if solving and not paused:
+            rate = SOLVE_SPEEDS[speed]
+            if rate is None:
+                count = None
+            else:
+                step_credit += rate / FPS
+                count = int(step_credit)
+                step_credit -= count
+            finished, last = pull_steps(steps, count)
+            if last is not None:
+                last_step = last
+            if finished:
+                solving = False
+                temp_board = [row[:] for row in board]
+                index = CandidateIndex(temp_board)
+
+        if check is not None and check.done():
+            solutions = check.result()
+            check = None
+
+        if solving:
+            dirty = renderer.draw(board, givens)
+        else:
+            dirty = renderer.draw(temp_board, selected=selected, index=index, pencil=pencil)
+        if dirty:
+            pygame.display.update(dirty)
+        new_caption = solve_caption(solving, paused, speed, customized, solutions, last_step, message)
+        if new_caption != caption:
+            caption = new_caption
+            pygame.display.set_caption(caption)
+        clock.tick(FPS)
+
+    checker.shutdown(wait=False, cancel_futures=True)
+    pygame.quit()
+    sys.exit()
+
+def pull_steps(steps, count=None):
+    """Advance the solver generator by count steps, or for FRAME_BUDGET seconds if count is None.
+
+    Returns (finished, last), where last is the last step pulled (None if none was).
+    """
+    deadline = time.perf_counter() + FRAME_BUDGET if count is None else None
+    pulled = 0
+    last = None
+    try:
+        while count is None or pulled < count:
+            last = next(steps)
+            pulled += 1
+            if deadline and pulled % 64 == 0 and time.perf_counter() > deadline:
+                break
+    except StopIteration:
+        return True, last
+    return False, last
+
+def check_board(checker, check, board):
+    """Count board's solutions in the checker process, dropping the previous check if it has not started."""
+    if check is not None:
+        check.cancel()
+    return checker.submit(count_solutions, [row[:] for row in board])
+
+def cancel_solve(steps):
+    """Stop a running solve, returning the new value of the solving flag."""
+    if steps is not None:
+        steps.close()
+    return False
+
+def describe_step(step):
+    """Caption text for a logic.Step."""
+    if len(step.placed) == 1:
+        (row, col), num = step.placed[0]
+        return f"{step.technique}: {DIGITS[num - 1]} at r{row + 1}c{col + 1}"
+    if step.placed:
+        return f"{step.technique}: {len(step.placed)} cells"
+    return f"{step.technique}: {len(step.eliminated)} candidates removed"
+
+def solve_caption(solving, paused, speed, customized=False, solutions=None, last_step=None, message=None):
+    if not solving:
+        caption = "Sudoku Solver"
+        if customized:
+            verdict = "checking..." if solutions is None else SOLUTION_LABELS[solutions]
+            caption += f" - custom board: {verdict}"
+        if message:
+            caption += f" | {message}"
+        return caption
+    rate = SOLVE_SPEEDS[speed]
+    rate = "max speed" if rate is None else f"{rate} steps/s"
+    state = "paused" if paused else "solving"
+    detail = f" | {describe_step(last_step)}" if isinstance(last_step, Step) else ""
+    return f"Sudoku Solver - {state} at {rate}{detail} (Space pause, Esc cancel, Up/Down speed)"
+
+class Renderer:
+    """Redraws only what changed since the last frame, from surfaces rendered once.
+
+    draw() compares each cell (digit, color, selection) and each button's
+    hover state with what is on screen and returns the rects it repainted,
+    ready for pygame.display.update(rects). An idle frame returns [].
+    """
+
+    def __init__(self, screen, size=9):
+        self.screen = screen
+        self.size = size
+        self.cell_size = WIDTH // size
+        self.background = pygame.Surface(screen.get_size())
+        self.background.fill(WHITE)
+        draw_grid(self.background, size)
+        self.buttons = {text: button_rect(center_x) for text, center_x in BUTTONS}
+        self.invalidate()
+
+    def invalidate(self):
+        """Force a full repaint on the next draw, e.g. after the window was exposed."""
+        self.cells = [[None] * self.size for _ in range(self.size)]
+        self.hovered = dict.fromkeys(self.buttons)
+        self.full = True
+
+    def draw(self, board, givens=None, selected=None, index=None, pencil=False):
+        """Bring the screen up to date, returning the dirty rects.
+
+        Digits that are not in givens are drawn in the solver's placing
+        color; with givens None every digit is drawn in black. With index
+        (a logic.CandidateIndex of board) clashing digits are highlighted,
+        and with pencil as well empty cells show their candidates.
+        """
+        dirty = []
+        if self.full:
+            self.screen.blit(self.background, (0, 0))
+            dirty.append(self.screen.get_rect())
+            self.full = False
+        for i in range(self.size):
+            for j in range(self.size):
+                num = board[i][j]
+                if not num:
+                    color = None
+                elif givens is None or givens[i][j]:
+                    color = BLACK
+                else:
+                    color = PLACE_COLOR
+                conflict = index is not None and index.conflicts(i, j)
+                marks = index.candidates(i * self.size + j) if pencil and index and not num else 0
+                state = (num, color, (i, j) == selected, conflict, marks)
+                if self.cells[i][j] != state:
+                    self.cells[i][j] = state
+                    dirty.append(self.draw_cell(i, j, *state))
+        mouse_pos = pygame.mouse.get_pos()
+        for text, rect in self.buttons.items():
+            hover = rect.collidepoint(mouse_pos)
+            if self.hovered[text] != hover:
+                self.hovered[text] = hover
+                dirty.append(draw_button(self.screen, text, rect, hover))
+        return dirty
+
+    def draw_cell(self, row, col, num, color, selected, conflict=False, marks=0):
+        cell_size = self.cell_size
+        rect = pygame.Rect(col * cell_size, row * cell_size, cell_size, cell_size)
+        self.screen.blit(self.background, rect, rect)
+        if conflict:
+            pygame.draw.rect(self.screen, CONFLICT_COLOR, rect.inflate(-4, -4))
+        if num:
+            blit_centered(self.screen, digit_glyphs(color, self.size)[num], rect)
+        elif marks:
+            box = isqrt(self.size)
+            step = cell_size / box
+            glyphs = pencil_glyphs(self.size)
+            for d in range(1, self.size + 1):
+                if marks >> d & 1:
+                    k, m = divmod(d - 1, box)
+                    mark = pygame.Rect(rect.x + int(m * step), rect.y + int(k * step), int(step), int(step))
+                    blit_centered(self.screen, glyphs[d], mark)
+        if selected:
+            pygame.draw.rect(self.screen, SELECTED_COLOR, rect, 3)
+        return rect
+
+@functools.lru_cache(maxsize=None)
+def get_font(size):
+    return pygame.font.Font(None, size)
+
+@functools.lru_cache(maxsize=None)
+def digit_glyphs(color, size=9):
+    """Pre-rendered surfaces for the digits 1-size in color, indexed by digit.
+
+    The font shrinks with the cells; digits above 9 are letters (see DIGITS).
+    """
+    font = get_font(max(16, 40 * 9 // size))
+    return [None] + [font.render(DIGITS[num - 1], True, color) for num in range(1, size + 1)]
+
+@functools.lru_cache(maxsize=None)
+def pencil_glyphs(size=9):
+    """Small pre-rendered candidate digits, box x box of them to a cell."""
+    font = get_font(max(9, WIDTH // size // isqrt(size) + 2))
+    return [None] + [font.render(DIGITS[num - 1], True, PENCIL_COLOR) for num in range(1, size + 1)]
+
+def blit_centered(screen, surface, rect):
+    screen.blit(surface, (
+        rect.centerx - surface.get_width() // 2,
+        rect.centery - surface.get_height() // 2
+    ))
+
+def draw_grid(screen, size=9):
+    cell_size = WIDTH // size
+    box = isqrt(size)
+    end = size * cell_size
+    for i in range(size + 1):
+        line_width = THICK_LINE if i % box == 0 else THIN_LINE
+        pygame.draw.line(screen, BLACK, (0, i * cell_size), (end, i * cell_size), line_width)
+        pygame.draw.line(screen, BLACK, (i * cell_size, 0), (i * cell_size, end), line_width)
+
+def button_rect(center_x, y_offset=545):
+    return pygame.Rect(center_x - 90, y_offset, 180, 40)
+
+@functools.lru_cache(maxsize=None)
+def button_label(text):
+    return get_font(36).render(text, True, BUTTON_TEXT_COLOR)
+
+def draw_button(screen, text, rect, hover=False):
+    color = BUTTON_HOVER_COLOR if hover else BUTTON_COLOR
+    pygame.draw.rect(screen, WHITE, rect)
+    pygame.draw.rect(screen, color, rect, border_radius=6)
+    blit_centered(screen, button_label(text), rect)
+    return rect
\ No newline at end of file
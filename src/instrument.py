@@ -0,0 +1,68 @@
+"""Ready-made solve hooks for profiling the solver from the outside.
+
+Both plug into solver.solve_hook(), so no solver code has to change:
+
+    with profiling() as profiler:
+        solve(board)
+    profiler.print_stats("cumulative")
+
+    with solve_hook(StackSampler(interval=0.001)) as sampler:
+        solve(board)
+    print(sampler.samples.most_common(10))
+"""
+import cProfile
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+from solver import solve_hook
+
+
+@contextmanager
+def profiling(profiler=None):
+    """Run cProfile during every solve inside the with block, yielding the profiler."""
+    profiler = profiler or cProfile.Profile()
+
+    @contextmanager
+    def hook(board, strategy):
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+
+    with solve_hook(hook):
+        yield profiler
+
+
+class StackSampler:
+    """Solve hook that samples the solving thread's current line every interval seconds.
+
+    samples counts "function:line" strings across every solve it wrapped.
+    Sampling runs on a background thread, so it only sees the solver when
+    the GIL switches (see sys.setswitchinterval).
+    """
+
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.samples = Counter()
+
+    @contextmanager
+    def __call__(self, board, strategy):
+        target = threading.get_ident()
+        stop = threading.Event()
+
+        def sample():
+            while not stop.wait(self.interval):
+                frame = sys._current_frames().get(target)
+                if frame is not None:
+                    self.samples[f"{frame.f_code.co_name}:{frame.f_lineno}"] += 1
+
+        thread = threading.Thread(target=sample, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
@@ -0,0 +1,104 @@
+"""Load-test a running solving server (server.py) on localhost.
+
+Usage: python -m loadtest --port 8080 -n 2000 -c 32 --puzzles corpus.txt
+
+Opens --concurrency keep-alive connections that post puzzles back to back
+until --requests have been sent, cycling through the puzzle file (or the
+bundled benchmark tiers), then reports requests per second, the p50 / p99
+/ max latency and how many responses had each status code.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from collections import Counter
+from itertools import cycle
+
+from puzzles import BENCHMARK_TIERS
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+async def _post(reader, writer, host, body):
+    writer.write(
+        f"POST /solve HTTP/1.1\r\nHost: {host}\r\nContent-Type: text/plain\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+async def _client(host, port, puzzles, remaining, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            body = next(puzzles).encode()
+            start = time.perf_counter()
+            status = await _post(reader, writer, host, body)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] += 1
+    finally:
+        writer.close()
+
+async def run(host, port, puzzles, requests=1000, concurrency=16):
+    """Send requests puzzles over concurrency connections, returning the report dict."""
+    latencies = []
+    statuses = Counter()
+    remaining = [requests]
+    source = cycle(puzzles)
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, source, remaining, latencies, statuses) for _ in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+        "statuses": dict(statuses),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description="Measure latency and throughput of the solving server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("-p", "--port", type=int, default=8080)
+    parser.add_argument("-n", "--requests", type=int, default=1000)
+    parser.add_argument("-c", "--concurrency", type=int, default=16, help="open connections")
+    parser.add_argument("--puzzles", help="file with one puzzle line per row (default: the benchmark tiers)")
+    args = parser.parse_args(argv)
+    if args.requests < 1 or args.concurrency < 1:
+        parser.error("--requests and --concurrency must be positive")
+
+    if args.puzzles:
+        with open(args.puzzles) as f:
+            puzzles = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    else:
+        puzzles = [p for tier in BENCHMARK_TIERS.values() for p in tier]
+    report = asyncio.run(run(args.host, args.port, puzzles, args.requests, args.concurrency))
+    print(f"{report['requests']} requests in {report['seconds']:.2f}s, {report['rps']:.0f} req/s")
+    print(f"latency p50 {report['p50_ms']:.1f} ms, p99 {report['p99_ms']:.1f} ms, max {report['max_ms']:.1f} ms")
+    print("statuses: " + ", ".join(f"{code} x{n}" for code, n in sorted(report["statuses"].items())))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
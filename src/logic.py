@@ -0,0 +1,381 @@
+"""Human-style logical solver that records the technique behind every step.
+
+Techniques are tried cheapest first, restarting from the top after every
+successful step: naked and hidden singles, naked and hidden pairs and
+triples, pointing and box-line reduction, X-wing and swordfish. Only when
+all of them stall does solve_logically() fall back to search, recorded as
+one final "search" step.
+
+LogicGrid keeps a candidate bitmask per cell and, for every unit and
+digit, a bitmask of the unit slots the digit can still go in. Both are
+updated incrementally on each placement and elimination, so a technique
+reads its unit/digit patterns straight from the index instead of
+rescanning rows, columns and boxes.
+"""
+import functools
+from itertools import combinations
+
+from solver import Grid, solve
+
+# Technique names in the order they are tried, used as Step.technique
+TECHNIQUES = (
+    "naked single", "hidden single", "naked pair", "hidden pair", "naked triple",
+    "hidden triple", "pointing", "box-line reduction", "x-wing", "swordfish",
+)
+
+
+class Step:
+    """One deduction: the technique used, digits placed and candidates eliminated.
+
+    placed and eliminated are lists of ((row, col), num).
+    """
+    __slots__ = ("technique", "placed", "eliminated")
+
+    def __init__(self, technique, placed=(), eliminated=()):
+        self.technique = technique
+        self.placed = list(placed)
+        self.eliminated = list(eliminated)
+
+    def __repr__(self):
+        return f"Step({self.technique!r}, placed={self.placed}, eliminated={self.eliminated})"
+
+
+@functools.lru_cache(maxsize=None)
+def _tables(size):
+    """Per-cell (unit, slot) pairs and peer lists for a board size."""
+    geo = Grid(size).geo
+    cell_units = [[] for _ in range(geo.area)]
+    for u, unit in enumerate(geo.units):
+        for slot, i in enumerate(unit):
+            cell_units[i].append((u, slot))
+    peers = [
+        sorted({j for u, _ in cell_units[i] for j in geo.units[u]} - {i})
+        for i in range(geo.area)
+    ]
+    return cell_units, peers
+
+def _bits(mask):
+    """Yield the set bit numbers of mask, lowest first."""
+    while mask:
+        bit = mask & -mask
+        mask ^= bit
+        yield bit.bit_length() - 1
+
+
+class LogicGrid:
+    """Board with incrementally maintained candidate and unit/digit position indexes.
+
+    cands[i] is cell i's candidate bitmask (0 once filled) and where[u][d]
+    the bitmask of slots in unit u (its index in geo.units[u]) where digit
+    d can still go, and placed[u] the digits already in unit u. Units are
+    numbered rows, then columns, then boxes. ok turns False as soon as an
+    update leaves an empty cell without candidates or a missing digit with
+    no slot in some unit.
+    """
+    __slots__ = ("geo", "size", "cells", "cands", "where", "placed", "ok", "cell_units", "peers")
+
+    def __init__(self, grid):
+        geo = self.geo = grid.geo
+        size = self.size = grid.size
+        self.cell_units, self.peers = _tables(size)
+        self.cells = bytearray(grid.cells)
+        self.cands = [0 if num else grid.candidates(i) for i, num in enumerate(grid.cells)]
+        self.where = [[0] * (size + 1) for _ in geo.units]
+        self.placed = [0] * len(geo.units)
+        for u, unit in enumerate(geo.units):
+            where = self.where[u]
+            for slot, i in enumerate(unit):
+                if self.cells[i]:
+                    self.placed[u] |= 1 << self.cells[i]
+                for d in _bits(self.cands[i]):
+                    where[d] |= 1 << slot
+        self.ok = all(num or self.cands[i] for i, num in enumerate(self.cells))
+        for u, where in enumerate(self.where):
+            reachable = sum(1 << d for d in range(1, size + 1) if where[d])
+            if self.placed[u] | reachable != geo.all_digits:
+                self.ok = False
+
+    def position(self, i):
+        return divmod(i, self.size)
+
+    def place(self, i, num):
+        """Fill cell i with num, dropping its other candidates and num from its peers."""
+        if not self.cands[i] >> num & 1:
+            self.ok = False
+            return
+        for u, _ in self.cell_units[i]:
+            self.placed[u] |= 1 << num
+        for d in _bits(self.cands[i]):
+            self._unlink(i, d)
+        self.cands[i] = 0
+        self.cells[i] = num
+        for j in self.peers[i]:
+            self.eliminate(j, num)
+
+    def eliminate(self, i, num):
+        """Remove num from cell i's candidates, returning whether it was there."""
+        bit = 1 << num
+        if not self.cands[i] & bit:
+            return False
+        self.cands[i] &= ~bit
+        if not self.cands[i]:
+            self.ok = False
+        self._unlink(i, num)
+        return True
+
+    def _unlink(self, i, num):
+        for u, slot in self.cell_units[i]:
+            where = self.where[u]
+            where[num] &= ~(1 << slot)
+            if not where[num] and not self.placed[u] >> num & 1:
+                self.ok = False
+
+    def apply(self, step):
+        for (row, col), num in step.placed:
+            self.place(row * self.size + col, num)
+        for (row, col), num in step.eliminated:
+            self.eliminate(row * self.size + col, num)
+
+    def _eliminations(self, cells, digits):
+        """The (pos, num) pairs among cells x digits that are still candidates."""
+        return [
+            (self.position(i), d)
+            for i in cells
+            for d in _bits(self.cands[i] & digits)
+        ]
+
+    def naked_single(self):
+        for i, free in enumerate(self.cands):
+            if free and not free & (free - 1):
+                return Step("naked single", [(self.position(i), free.bit_length() - 1)])
+        return None
+
+    def hidden_single(self):
+        for u, unit in enumerate(self.geo.units):
+            where = self.where[u]
+            for d in range(1, self.size + 1):
+                slots = where[d]
+                if slots and not slots & (slots - 1):
+                    return Step("hidden single", [(self.position(unit[slots.bit_length() - 1]), d)])
+        return None
+
+    def naked_subset(self, k):
+        """k cells of a unit whose candidates together are k digits clear them from the rest of the unit."""
+        name = "naked pair" if k == 2 else "naked triple"
+        for unit in self.geo.units:
+            open_cells = [i for i in unit if 1 < self.cands[i].bit_count() <= k]
+            for group in combinations(open_cells, k):
+                digits = 0
+                for i in group:
+                    digits |= self.cands[i]
+                if digits.bit_count() != k:
+                    continue
+                removed = self._eliminations([i for i in unit if i not in group], digits)
+                if removed:
+                    return Step(name, eliminated=removed)
+        return None
+
+    def hidden_subset(self, k):
+        """k digits confined to the same k cells of a unit clear every other candidate from those cells."""
+        name = "hidden pair" if k == 2 else "hidden triple"
+        for u, unit in enumerate(self.geo.units):
+            where = self.where[u]
+            digits = [d for d in range(1, self.size + 1) if 1 < where[d].bit_count() <= k]
+            for group in combinations(digits, k):
+                slots = 0
+                mask = 0
+                for d in group:
+                    slots |= where[d]
+                    mask |= 1 << d
+                if slots.bit_count() != k:
+                    continue
+                removed = self._eliminations([unit[s] for s in _bits(slots)], ~mask)
+                if removed:
+                    return Step(name, eliminated=removed)
+        return None
+
+    def locked_candidates(self):
+        """Pointing (a box's digit on one line) and box-line reduction (a line's digit in one box)."""
+        geo, size = self.geo, self.size
+        for u, unit in enumerate(geo.units):
+            is_box = u >= 2 * size
+            for d in range(1, size + 1):
+                slots = self.where[u][d]
+                if slots.bit_count() < 2:
+                    continue
+                cells = [unit[s] for s in _bits(slots)]
+                if is_box:
+                    lines = [geo.row_of[i] for i in cells], [size + geo.col_of[i] for i in cells]
+                else:
+                    lines = ([2 * size + geo.box_of[i] for i in cells],)
+                for found in lines:
+                    if len(set(found)) != 1:
+                        continue
+                    rest = [i for i in geo.units[found[0]] if i not in cells]
+                    removed = self._eliminations(rest, 1 << d)
+                    if removed:
+                        return Step("pointing" if is_box else "box-line reduction", eliminated=removed)
+        return None
+
+    def fish(self, n):
+        """X-wing (n=2) and swordfish (n=3): a digit's spots in n lines covering only n cross lines."""
+        name = "x-wing" if n == 2 else "swordfish"
+        geo, size = self.geo, self.size
+        for base, cover in ((0, size), (size, 0)):
+            for d in range(1, size + 1):
+                lines = [u for u in range(base, base + size) if 1 < self.where[u][d].bit_count() <= n]
+                for group in combinations(lines, n):
+                    slots = 0
+                    for u in group:
+                        slots |= self.where[u][d]
+                    if slots.bit_count() != n:
+                        continue
+                    rest = [
+                        i for s in _bits(slots) for i in geo.units[cover + s]
+                        if base + (geo.row_of[i] if base == 0 else geo.col_of[i]) not in group
+                    ]
+                    removed = self._eliminations(rest, 1 << d)
+                    if removed:
+                        return Step(name, eliminated=removed)
+        return None
+
+    def next_step(self):
+        """Return the cheapest applicable deduction, or None if every technique stalls."""
+        return (
+            self.naked_single() or self.hidden_single()
+            or self.naked_subset(2) or self.hidden_subset(2)
+            or self.naked_subset(3) or self.hidden_subset(3)
+            or self.locked_candidates() or self.fish(2) or self.fish(3)
+        )
+
+
+class CandidateIndex:
+    """Editable board whose conflicts and candidates stay current in O(1) per edit.
+
+    counts[u][d] is how many cells of unit u hold digit d and present[u]
+    the digits with a nonzero count, so set() touches three units and
+    candidates() and conflicts() are a few bit operations, however many
+    clashes the board has. It offers the geo/size/cells/candidates(i)
+    interface of solver.Grid, so a LogicGrid can start straight from it.
+    """
+    __slots__ = ("geo", "size", "cells", "counts", "present", "clashes", "cell_units")
+
+    def __init__(self, board):
+        size = self.size = len(board)
+        self.geo = Grid(size).geo
+        self.cell_units = _tables(size)[0]
+        self.cells = bytearray(self.geo.area)
+        self.counts = [[0] * (size + 1) for _ in self.geo.units]
+        self.present = [0] * len(self.geo.units)
+        self.clashes = 0
+        for r, row in enumerate(board):
+            for c, num in enumerate(row):
+                if num:
+                    self.set(r, c, num)
+
+    def set(self, row, col, num):
+        """Put num (0 to clear) at (row, col)."""
+        i = row * self.size + col
+        old = self.cells[i]
+        if old == num:
+            return
+        self.cells[i] = num
+        for u, _ in self.cell_units[i]:
+            counts = self.counts[u]
+            if old:
+                counts[old] -= 1
+                if counts[old] == 0:
+                    self.present[u] &= ~(1 << old)
+                elif counts[old] == 1:
+                    self.clashes -= 1
+            if num:
+                counts[num] += 1
+                if counts[num] == 1:
+                    self.present[u] |= 1 << num
+                elif counts[num] == 2:
+                    self.clashes += 1
+
+    def candidates(self, i):
+        """Bitmask of the digits that fit empty flat cell i (no peer holds them)."""
+        mask = 0
+        for u, _ in self.cell_units[i]:
+            mask |= self.present[u]
+        return self.geo.all_digits & ~mask
+
+    def conflicts(self, row, col):
+        """True if the digit at (row, col) also appears in one of its units."""
+        i = row * self.size + col
+        num = self.cells[i]
+        return bool(num) and any(self.counts[u][num] > 1 for u, _ in self.cell_units[i])
+
+    def hint(self):
+        """The next placement the logical techniques find, as a Step, or None.
+
+        Elimination-only deductions are applied on a scratch LogicGrid until
+        one yields a digit; a board with clashes or no deduction gives None.
+        """
+        if self.clashes:
+            return None
+        state = LogicGrid(self)
+        while state.ok and 0 in state.cells:
+            step = state.next_step()
+            if step is None:
+                return None
+            if step.placed:
+                return step
+            state.apply(step)
+        return None
+
+
+def solve_logically(board, fallback=True):
+    """Solve board step by step, returning (solution, trace).
+
+    trace is the list of Step records in the order they were applied, and
+    solution a new list of rows (None if the board has no solution, or if
+    the techniques stall and fallback is False). With fallback the rest of
+    the board is searched and recorded as one "search" step.
+    """
+    grid = Grid.load(board)
+    if grid is None:
+        return None, []
+    state = LogicGrid(grid)
+    trace = []
+    while state.ok and 0 in state.cells:
+        step = state.next_step()
+        if step is None:
+            break
+        state.apply(step)
+        trace.append(step)
+    if not state.ok:
+        return None, trace
+    size = state.size
+    current = [list(state.cells[r * size:(r + 1) * size]) for r in range(size)]
+    if 0 not in state.cells:
+        return current, trace
+    if not fallback:
+        return None, trace
+    solution = solve(current)
+    if solution is None:
+        return None, trace
+    trace.append(Step("search", [
+        ((r, c), solution[r][c]) for r in range(size) for c in range(size) if not current[r][c]
+    ]))
+    return solution, trace
+
+def hardest_technique(trace):
+    """The most advanced technique in trace ("search" beats every TECHNIQUES entry), or None."""
+    rank = {name: n for n, name in enumerate(TECHNIQUES + ("search",))}
+    return max((step.technique for step in trace), key=rank.__getitem__, default=None)
+
+def iter_logic_steps(board):
+    """Solve board in place as a generator of Step records, like solver.iter_steps.
+
+    board is updated with each step's placements before it is yielded.
+    The generator returns True if the board was solved.
+    """
+    solution, trace = solve_logically(board)
+    for step in trace:
+        for (row, col), num in step.placed:
+            board[row][col] = num
+        yield step
+    return solution is not None
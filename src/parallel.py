@@ -0,0 +1,173 @@
+"""Solve or count one hard puzzle by splitting its search tree across processes.
+
+Usage: python -m parallel --workers 8 [--count --limit 1000] [puzzles.txt]
+
+The top of the tree is expanded here until there are a few subtrees per
+worker, and each subtree is searched in the pool by
+solver.search_subtree. A worker whose subtree is still running when the
+queue has run dry hands back everything it has not explored yet as new
+subtrees, so idle workers pick up the rest of the largest searches (work
+stealing, with the task queue standing in for per-worker deques). The
+first solution stops every worker; when counting, the workers add every
+solution to one shared total and all stop once it reaches the limit,
+keeping no copies of the solutions. Without a file the hardest
+benchmark tier is used, and each puzzle is timed both in one process and
+in the pool.
+"""
+import argparse
+import os
+import sys
+import time
+from collections import Counter, deque
+
+from puzzles import BENCHMARK_TIERS, board_from_string
+from solver import search_subtree
+
+# Subtrees handed to each worker up front
+PIECES_PER_WORKER = 4
+
+_stop = _hungry = _total = None
+_limit = 0
+
+
+def split(board, pieces, limit=1):
+    """Expand board breadth first into at least pieces subtrees.
+
+    Returns (subtrees, solutions): flat boards that together cover the
+    whole tree, and any solutions (up to limit) met while expanding.
+    Fewer subtrees come back if the tree is smaller than that.
+    """
+    queue = deque([board])
+    solutions = []
+    while queue and len(queue) < pieces and len(solutions) < limit:
+        found, rest = search_subtree(queue.popleft(), limit - len(solutions), lambda: True, 1)
+        solutions.extend(found)
+        queue.extend(rest)
+    return list(queue), solutions
+
+def _init_worker(stop, hungry, total, limit):
+    global _stop, _hungry, _total, _limit
+    _stop, _hungry, _total, _limit = stop, hungry, total, limit
+
+def _reached():
+    return _stop.is_set() or _total.value >= _limit
+
+def _interrupted():
+    return _hungry.is_set() or _reached()
+
+def _tally(cells):
+    with _total.get_lock():
+        _total.value += 1
+        return _total.value >= _limit
+
+def search_piece(piece, limit, counting=False):
+    """Search one subtree in a worker, returning (solutions, rest).
+
+    rest holds the unexplored subtrees if the coordinator asked for work
+    back. When counting, solutions is just their number, and each one is
+    also added to the shared total the moment it is found.
+    """
+    solutions, rest = search_subtree(piece, limit, _interrupted, on_solution=_tally if counting else None)
+    if _reached():
+        rest = []
+    return solutions, rest
+
+def search(board, limit=1, workers=None, counting=False, stats=None):
+    """Search board across workers processes, returning up to limit solutions.
+
+    When counting, returns the number of solutions (at most limit) instead.
+    stats, a Counter if given, gets the "tasks" run and the "splits" where
+    a running subtree was handed back to share out.
+    """
+    workers = workers or os.cpu_count() or 1
+    stats = Counter() if stats is None else stats
+    pieces, solutions = split(board, workers * PIECES_PER_WORKER, limit)
+    found = len(solutions)
+    if found >= limit or not pieces:
+        return min(found, limit) if counting else solutions[:limit]
+    import multiprocessing
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    stop, hungry = multiprocessing.Event(), multiprocessing.Event()
+    # Solutions counted so far by every worker, checked against limit as they search
+    total = multiprocessing.Value("q", found)
+    pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(stop, hungry, total, limit))
+    try:
+        pending = {pool.submit(search_piece, piece, limit - found, counting) for piece in pieces}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result, rest = future.result()
+                stats["tasks"] += 1
+                stats["splits"] += bool(rest)
+                if counting:
+                    found = total.value
+                else:
+                    found += len(result)
+                    solutions.extend(result)
+                pending |= {pool.submit(search_piece, piece, limit - found, counting) for piece in rest}
+            if found >= limit:
+                stop.set()
+                break
+            # Ask running subtrees for work back once the queue is shorter than the pool
+            if sum(1 for future in pending if not future.running()) < workers:
+                hungry.set()
+            else:
+                hungry.clear()
+    finally:
+        stop.set()
+        pool.shutdown(cancel_futures=True)
+    return min(found, limit) if counting else solutions[:limit]
+
+def solve_parallel(board, workers=None):
+    """Return a solved copy of board, or None if it has no solution."""
+    solutions = search(board, 1, workers)
+    if not solutions:
+        return None
+    if isinstance(board[0], int):
+        return solutions[0]
+    size = len(board)
+    return [list(solutions[0][r * size:(r + 1) * size]) for r in range(size)]
+
+def count_parallel(board, limit=2, workers=None):
+    """Return how many solutions board has, counting no further than limit."""
+    return search(board, limit, workers, counting=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m parallel", description="Split one puzzle's search across worker processes.")
+    parser.add_argument("input", nargs="?", help="puzzle file (default: the hardest benchmark tier)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--count", action="store_true", help="count solutions instead of finding one")
+    parser.add_argument("--limit", type=int, default=2, help="stop counting at this many solutions")
+    args = parser.parse_args(argv)
+    if args.limit < 1 or (args.workers is not None and args.workers < 1):
+        parser.error("--workers and --limit must be positive")
+
+    if args.input:
+        with open(args.input) as f:
+            lines = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    else:
+        lines = list(BENCHMARK_TIERS.values())[-1]
+    limit = args.limit if args.count else 1
+    workers = args.workers or os.cpu_count() or 1
+    for number, line in enumerate(lines, 1):
+        board = board_from_string(line)
+        start = time.perf_counter()
+        serial = search_subtree(board, limit, on_solution=(lambda cells: False) if args.count else None)[0]
+        serial_time = time.perf_counter() - start
+        stats = Counter()
+        start = time.perf_counter()
+        result = search(board, limit, workers, args.count, stats)
+        parallel_time = time.perf_counter() - start
+        answer = f"{result} solutions" if args.count else ("solved" if result else "no solution")
+        if args.count and result != serial or not args.count and bool(result) != bool(serial):
+            print(f"puzzle {number}: serial and parallel disagree", file=sys.stderr)
+            return 1
+        print(f"puzzle {number}: {answer}, 1 process {serial_time * 1000:.1f} ms, {workers} workers "
+              f"{parallel_time * 1000:.1f} ms ({serial_time / parallel_time:.2f}x), "
+              f"{stats['tasks']} tasks, {stats['splits']} splits")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
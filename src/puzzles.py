@@ -1,4 +1,61 @@
-def get_example_board():
+from math import isqrt
+
+# Digit alphabet for puzzle lines: 1-9, then letters for 10-25
+DIGITS = "123456789ABCDEFGHIJKLMNOP"
+
+# Larger example boards, one line per row in the DIGITS alphabet
+LARGE_EXAMPLES = {
+    16: [
+        "49.82AC.F1.3.5..",
+        ".1F..67549.8..C.",
+        ".A.G..E1.5..894B",
+        "7....8492.C.31E.",
+        ".84.....3...96.7",
+        "D.E5.9....2A1...",
+        ".G...5D3....A.2.",
+        "..7.4...CG......",
+        "AB84G.....5.7..6",
+        ".D6.8...G.1..F5.",
+        "5.3.6....BA.C...",
+        "....3.5..D.7.B.8",
+        "6..D..8.......31",
+        ".....2G.1C.....5",
+        "G4A.1.3C..6D...9",
+        ".....D6E97.B24G.",
+    ],
+    25: [
+        "..7.2....KL.6BECF.ONJ.DPM",
+        "...IDE..L6291.73HA...C..F",
+        "....O79.21DMPIJB8EL..34KH",
+        "8..BL5FCO.4H.3AIMJ...G21.",
+        "H.A3......OFNC5G9..1...68",
+        "DJ9.3.L..E....8K.F..MN..O",
+        "27..G...3ABL..H.O..59PI.D",
+        "O5.NC..1.7IDJP96.HB..K3..",
+        "4.FK.9...J.O5.M12....6...",
+        "LEH6BM...5..A..P.9I..1G72",
+        "AC.O.1J2.GM...PL7.8BK..3E",
+        "...DM.7L...J.2.4E..3NOFCA",
+        "E3K4.P5DMIFA..N2.1.G6.8B.",
+        ".G...KE4H3.7BL...NFCPDMI.",
+        ".B6.8NAOFCHE34KD5PMI.2...",
+        "38L.1..A.....E45.......9I",
+        "I92.....6H..87.A.OKF.5..C",
+        "BH....C5N.K.FAO...P9L71.G",
+        "..OA..IJP.N.M5.7.L..4.6HB",
+        "CMD5NL.7..P...2EB..HOAKF.",
+        "N.IM5B1......9.H.3..CF.OK",
+        "KO..A.P.J25N.MI..B7L3HE46",
+        "...9J36HE4.1L..FKCAO...DN",
+        "..3.EI....AKOF.....2.8.L.",
+        ".LB8..KFA.E6.H3M...DG9..P",
+    ],
+}
+
+def get_example_board(size=9):
+    """Return a fresh example board of the given size (9, 16 or 25)."""
+    if size != 9:
+        return board_from_string("".join(LARGE_EXAMPLES[size]))
     return [
         [7, 8, 0, 4, 0, 0, 1, 2, 0],
         [6, 0, 0, 0, 7, 5, 0, 0, 9],
@@ -9,4 +66,64 @@ def get_example_board():
         [0, 7, 0, 3, 0, 0, 0, 1, 2],
         [1, 2, 0, 0, 0, 7, 4, 0, 0],
         [0, 4, 9, 2, 0, 6, 0, 0, 7]
-    ]
\ No newline at end of file
+    ]
+
+# Benchmark corpora as 81-character lines, from easiest to most adversarial
+BENCHMARK_TIERS = {
+    "easy": [
+        "780400120600075009000601078007040260001050930904060005070300012120007400049206007",
+        "003020600900305001001806400008102900700000008006708200002609500800203009005010300",
+        "200080300060070084030500209000105408000000000402706000301007040720040060004010003",
+        "000000907000420180000705026100904000050000040000507009920108000034059000507000000",
+        "030050040008010500460000012070502080000603000040109030250000098001020600080060020",
+    ],
+    "hard": [
+        "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..",
+        "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+        "52...6.........7.13...........4..8..6......5...........418.........3..2...87.....",
+        "6.....8.3.4.7.................5.4.7.3..2.....1.6.......2.....5.....8.6......1....",
+        "48.3............71.2.......7.5....6....2..8.............1.76...3.....4......5....",
+    ],
+    "17-clue": [
+        "000000010400000000020000000000050407008000300001090000300400200050100000000806000",
+        "000000010400000000020000000000050604008000300001090000300400200050100000000807000",
+        "000000012000035000000600070700000300000400800100000000000120000080000040050000600",
+        "000000012003600000000007000410020000000500300700000600280000040000300500000000000",
+    ],
+    # Solutions start 9-8-7... so row-major 1-9 backtracking explores millions of nodes
+    "anti-backtracking": [
+        "..............3.85..1.2.......5.7.....4...1...9.......5......73..2.1........4...9",
+        ".......2.4.........1...........3.4.6..5...7....2.8....7..4..1...3.2........5.9...",
+        ".......21....73......9...8.8.....7.....4..6..2...........21.....6.....4..3....9..",
+    ],
+}
+
+def board_from_string(line):
+    """Parse a puzzle line ('.' or '0' for blanks) into a size x size board.
+
+    The size follows from the length: 81, 256 or 625 characters for 9x9,
+    16x16 or 25x25, with digits above 9 written as letters (see DIGITS).
+    """
+    line = line.strip()
+    size = isqrt(len(line))
+    box = isqrt(size)
+    if size * size != len(line) or box * box != size or not 1 < size <= len(DIGITS):
+        raise ValueError(f"expected 81, 256 or 625 characters, got {len(line)}")
+    values = DIGITS[:size]
+    board = []
+    for r in range(size):
+        row = []
+        for ch in line[r * size:(r + 1) * size]:
+            if ch == "." or ch == "0":
+                row.append(0)
+            else:
+                num = values.find(ch.upper()) + 1
+                if not num:
+                    raise ValueError(f"invalid character {ch!r}")
+                row.append(num)
+        board.append(row)
+    return board
+
+def board_to_string(board, blank="."):
+    """Format a board as a single line, size * size characters long."""
+    return "".join(DIGITS[num - 1] if num else blank for row in board for num in row)
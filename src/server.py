@@ -0,0 +1,306 @@
+"""Local HTTP/JSON solving service on asyncio, with solves run in a process pool.
+
+Usage: python -m server --port 8080 --workers 4 --max-pending 16
+
+POST /solve takes a JSON object, a JSON puzzle string or board, or a
+bare puzzle line:
+
+    {"puzzle": "8..........36......7..9.2...", "strategy": "mrv", "timeout": 2.0}
+    {"board": [[7, 8, 0, 4, 0, 0, 1, 2, 0], ...]}
+    "8..........36......7..9.2..."
+    [[7, 8, 0, 4, 0, 0, 1, 2, 0], ...]
+
+and answers {"solved": true, "solution": "<line>", "board": [[...]],
+"coalesced": false, "seconds": 0.004}. GET /health returns counters.
+
+Identical puzzles already being solved share one pool job, unless the
+newcomer's timeout runs past the job's deadline. Each request waits at most
+its timeout (504 when it runs out), and a job nobody waits for any more
+is dropped from the pool queue; one that already started is stopped
+inside the worker once the timeout of the request that started it has
+passed (never later than --max-budget), so short timeouts cannot keep
+workers busy. When --max-pending jobs are in flight new puzzles get 503
+with Retry-After instead of queueing.
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from puzzles import board_from_string, board_to_string
+from solver import STRATEGIES, solve
+
+DEFAULT_BUDGET = 5.0
+MAX_BUDGET = 30.0
+MAX_BODY = 64 * 1024
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable", 504: "Gateway Timeout"}
+
+
+class ServerBusy(Exception):
+    """Raised when max_pending solves are already in flight."""
+
+
+def _expire(signum, frame):
+    raise TimeoutError("solve budget exceeded")
+
+def solve_line(line, strategy="mrv", budget=None):
+    """Solve one puzzle line in a worker, returning the solution line ("" if none).
+
+    With budget set the solve is interrupted by SIGALRM after that many
+    seconds and raises TimeoutError (where setitimer exists, i.e. not on
+    Windows). Pool workers run tasks on their main thread, so the signal
+    lands inside the search itself.
+    """
+    timed = budget and hasattr(signal, "setitimer")
+    if timed:
+        signal.signal(signal.SIGALRM, _expire)
+        signal.setitimer(signal.ITIMER_REAL, budget)
+    try:
+        solution = solve(board_from_string(line), strategy)
+    finally:
+        if timed:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    return board_to_string(solution) if solution else ""
+
+
+class _Job:
+    __slots__ = ("future", "deadline", "waiters")
+
+    def __init__(self, future, deadline):
+        self.future = future
+        self.deadline = deadline
+        self.waiters = 0
+
+
+class SolveService:
+    """Coalescing, bounded front end to a process pool of solve_line() calls."""
+
+    def __init__(self, workers=None, max_pending=None, max_budget=MAX_BUDGET):
+        workers = self.workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(workers)
+        self.max_pending = max_pending or 16 * workers
+        self.max_budget = max_budget
+        self.counters = dict.fromkeys(("requests", "solved", "unsolvable", "coalesced", "rejected", "timeouts"), 0)
+        self._jobs = {}
+        self._inflight = set()
+
+    async def solve(self, line, strategy="mrv", budget=DEFAULT_BUDGET):
+        """Return (solution_line, coalesced) for a normalized puzzle line.
+
+        Raises ServerBusy when the pool is saturated and TimeoutError when
+        budget seconds pass first.
+        """
+        self.counters["requests"] += 1
+        budget = min(budget, self.max_budget)
+        deadline = asyncio.get_running_loop().time() + budget
+        key = (line, strategy)
+        job = self._jobs.get(key)
+        # A job is stopped once its budget has run out, so only join one that lasts until our deadline
+        coalesced = job is not None and job.deadline >= deadline
+        if coalesced:
+            self.counters["coalesced"] += 1
+        else:
+            self._inflight = {f for f in self._inflight if not f.done()}
+            if len(self._inflight) >= self.max_pending:
+                self.counters["rejected"] += 1
+                raise ServerBusy(f"{len(self._inflight)} solves in flight")
+            pool_future = self._submit(line, strategy, budget)
+            self._inflight.add(pool_future)
+            job = self._jobs[key] = _Job(asyncio.wrap_future(pool_future), deadline)
+            job.future.add_done_callback(lambda _: self._forget(key, job))
+        job.waiters += 1
+        try:
+            solution = await asyncio.wait_for(asyncio.shield(job.future), budget)
+        except TimeoutError:
+            self.counters["timeouts"] += 1
+            raise
+        finally:
+            job.waiters -= 1
+            if not job.waiters and not job.future.done():
+                # Nobody is listening: drop it from the pool queue if it has not started
+                job.future.cancel()
+                self._forget(key, job)
+        self.counters["solved" if solution else "unsolvable"] += 1
+        return solution, coalesced
+
+    def _submit(self, line, strategy, budget):
+        try:
+            return self.pool.submit(solve_line, line, strategy, budget)
+        except BrokenProcessPool:
+            # A worker died (killed, out of memory); start over with a fresh pool
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = ProcessPoolExecutor(self.workers)
+            return self.pool.submit(solve_line, line, strategy, budget)
+
+    def _forget(self, key, job):
+        if self._jobs.get(key) is job:
+            del self._jobs[key]
+
+    def stats(self):
+        return dict(self.counters, in_flight=sum(1 for f in self._inflight if not f.done()),
+                    max_pending=self.max_pending)
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    async def handle(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection until the client closes it."""
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                status, payload = await self.route(method, path, body)
+                # An oversized body was left unread, so the stream cannot be reused
+                keep_alive = body is not None and headers.get("connection", "").lower() != "close"
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def route(self, method, path, body):
+        """Return (status, payload) for one request."""
+        if path == "/health":
+            return 200, self.stats()
+        if path != "/solve":
+            return 404, {"error": f"no route for {path}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        if body is None:
+            return 413, {"error": f"body over {MAX_BODY} bytes"}
+        try:
+            line, strategy, budget = parse_solve_request(body)
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        start = time.perf_counter()
+        try:
+            solution, coalesced = await self.solve(line, strategy, budget)
+        except ServerBusy as e:
+            return 503, {"error": f"server busy: {e}"}
+        except TimeoutError:
+            return 504, {"error": "time budget exceeded"}
+        except BrokenProcessPool:
+            return 500, {"error": "solver process died"}
+        payload = {"solved": bool(solution), "coalesced": coalesced,
+                   "seconds": round(time.perf_counter() - start, 6)}
+        if solution:
+            payload["solution"] = solution
+            payload["board"] = board_from_string(solution)
+        return 200, payload
+
+
+def parse_solve_request(body):
+    """Return (line, strategy, budget) from a /solve body, raising ValueError if it is malformed.
+
+    Bodies starting with {, [ or " are JSON: an object with a "board" or
+    "puzzle" field, a board of rows, or a puzzle string. Anything else is
+    a bare puzzle line. line comes back normalized through
+    board_from_string, so '0' and '.' blanks coalesce with each other.
+    """
+    text = body.decode("utf-8", "replace").strip()
+    strategy, budget = "mrv", DEFAULT_BUDGET
+    if text[:1] in ("{", "[", '"'):
+        try:
+            request = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"invalid JSON: {e}") from None
+        if isinstance(request, dict):
+            strategy = request.get("strategy", strategy)
+            budget = request.get("timeout", budget)
+            if "board" in request:
+                text = _board_line(request["board"])
+            elif "puzzle" in request:
+                text = str(request["puzzle"])
+            else:
+                raise ValueError('expected a "board" or "puzzle" field')
+        elif isinstance(request, list):
+            text = _board_line(request)
+        else:
+            text = request
+    if strategy not in STRATEGIES:
+        raise ValueError(f"unknown strategy {strategy!r}")
+    if not isinstance(budget, (int, float)) or budget <= 0:
+        raise ValueError("timeout must be a positive number of seconds")
+    return board_to_string(board_from_string(text)), strategy, float(budget)
+
+def _board_line(board):
+    if not isinstance(board, list) or not all(isinstance(row, list) and len(row) == len(board) for row in board):
+        raise ValueError("board must be a square list of rows")
+    if not all(isinstance(num, int) and 0 <= num <= len(board) for row in board for num in row):
+        raise ValueError(f"board cells must be integers from 0 to {len(board)}")
+    return board_to_string(board)
+
+async def _read_request(reader):
+    """Read one request as (method, path, headers, body), or None at end of stream.
+
+    body is None when Content-Length is over MAX_BODY.
+    """
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+    path = path.split("?", 1)[0]
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    if length > MAX_BODY:
+        return method, path, headers, None
+    body = await reader.readexactly(length) if length else b""
+    return method, path, headers, body
+
+def _response(status, payload, keep_alive=True):
+    body = json.dumps(payload).encode()
+    head = [
+        f"HTTP/1.1 {status} {REASONS[status]}",
+        "Content-Type: application/json",
+        f"Content-Length: {len(body)}",
+        "Connection: " + ("keep-alive" if keep_alive else "close"),
+    ]
+    if status == 503:
+        head.append("Retry-After: 1")
+    return ("\r\n".join(head) + "\r\n\r\n").encode() + body
+
+async def serve(service, host="127.0.0.1", port=8080):
+    server = await asyncio.start_server(service.handle, host, port)
+    address = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"serving on {address}", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m server", description="Serve Sudoku solves over local HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("-p", "--port", type=int, default=8080)
+    parser.add_argument("-j", "--workers", type=int, default=None, help="solver processes (default: CPU count)")
+    parser.add_argument("--max-pending", type=int, default=None, help="solves in flight before answering 503 (default: 16 per worker)")
+    parser.add_argument("--max-budget", type=float, default=MAX_BUDGET, help="cap on any request's timeout, and on each worker solve")
+    args = parser.parse_args(argv)
+
+    service = SolveService(args.workers, args.max_pending, args.max_budget)
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,54 @@
-import pygame
+import functools
 import time
+from contextlib import ExitStack, contextmanager
+from math import isqrt
+
+import dlx
+
+SIZE = 9
+
+
+class Geometry:
+    """Lookup tables for a size x size board split into box x box boxes.
+
+    Cells are flat indices (index = row * size + col); row_of, col_of and
+    box_of map an index to its units and units lists the cells of every
+    row, column and box.
+    """
+    __slots__ = ("size", "box", "area", "all_digits", "row_of", "col_of", "box_of", "units")
+
+    def __init__(self, size):
+        box = isqrt(size)
+        if box * box != size:
+            raise ValueError(f"board size must be a perfect square, got {size}")
+        self.size = size
+        self.box = box
+        self.area = size * size
+        self.all_digits = sum(1 << n for n in range(1, size + 1))
+        cells = range(self.area)
+        self.row_of = [i // size for i in cells]
+        self.col_of = [i % size for i in cells]
+        self.box_of = [(i // size) // box * box + (i % size) // box for i in cells]
+        self.units = (
+            [[r * size + c for c in range(size)] for r in range(size)]
+            + [[r * size + c for r in range(size)] for c in range(size)]
+            + [[i for i in cells if self.box_of[i] == b] for b in range(size)]
+        )
+
+@functools.lru_cache(maxsize=None)
+def geometry(size=SIZE):
+    return Geometry(size)
+
+def board_cells(board):
+    """Flatten a board into a bytearray of cell values.
+
+    board is either a list of rows or an already flat sequence of
+    size * size values (bytes, bytearray, array or list of ints).
+    """
+    if board and not isinstance(board[0], int):
+        return bytearray(num for row in board for num in row)
+    return bytearray(board)
+
 
 def is_valid(board, num, pos):
     """Check if num can be placed at pos without violating Sudoku rules."""
@@ -11,11 +60,12 @@ def is_valid(board, num, pos):
     for i in range(len(board)):
         if board[i][pos[1]] == num and pos[0] != i:
             return False
-    # 3x3 Box
-    box_x = pos[1] // 3
-    box_y = pos[0] // 3
-    for i in range(box_y*3, box_y*3 + 3):
-        for j in range(box_x*3, box_x*3 + 3):
+    # Box (3x3 on a 9x9 board)
+    box = isqrt(len(board))
+    box_x = pos[1] // box
+    box_y = pos[0] // box
+    for i in range(box_y*box, box_y*box + box):
+        for j in range(box_x*box, box_x*box + box):
             if board[i][j] == num and (i, j) != pos:
                 return False
     return True
@@ -28,25 +78,585 @@ def find_empty(board):
                 return (i, j)
     return None
 
+
+class Grid:
+    """Flat Sudoku board with row, column and box digit bitmasks kept in sync.
+
+    cells is a bytearray of size * size values (0 for empty), so copies and
+    memory stay small even on 25x25 boards.
+    """
+    __slots__ = ("geo", "size", "cells", "rows", "cols", "boxes", "row_of", "col_of", "box_of", "all_digits")
+
+    def __init__(self, size=SIZE):
+        geo = self.geo = geometry(size)
+        self.size = size
+        self.cells = bytearray(geo.area)
+        self.rows = [0] * size
+        self.cols = [0] * size
+        self.boxes = [0] * size
+        self.row_of, self.col_of, self.box_of = geo.row_of, geo.col_of, geo.box_of
+        self.all_digits = geo.all_digits
+
+    @classmethod
+    def load(cls, board):
+        """Build a Grid from a list of rows or a flat sequence, or return None if the givens clash."""
+        cells = board_cells(board)
+        grid = cls(isqrt(len(cells)))
+        if len(cells) != grid.geo.area:
+            raise ValueError(f"a board needs a square number of cells, got {len(cells)}")
+        for i, num in enumerate(cells):
+            if num:
+                if not grid.candidates(i) >> num & 1:
+                    return None
+                grid.place(i, num)
+        return grid
+
+    def candidates(self, i):
+        """Bitmask of the digits that can still go in cell i (bit n set for digit n)."""
+        return self.all_digits & ~(self.rows[self.row_of[i]] | self.cols[self.col_of[i]] | self.boxes[self.box_of[i]])
+
+    def place(self, i, num):
+        bit = 1 << num
+        self.cells[i] = num
+        self.rows[self.row_of[i]] |= bit
+        self.cols[self.col_of[i]] |= bit
+        self.boxes[self.box_of[i]] |= bit
+
+    def remove(self, i):
+        bit = ~(1 << self.cells[i])
+        self.cells[i] = 0
+        self.rows[self.row_of[i]] &= bit
+        self.cols[self.col_of[i]] &= bit
+        self.boxes[self.box_of[i]] &= bit
+
+    def empties(self):
+        return [i for i, num in enumerate(self.cells) if num == 0]
+
+    def position(self, i):
+        return self.row_of[i], self.col_of[i]
+
+    def to_board(self):
+        size = self.size
+        return [list(self.cells[r * size:(r + 1) * size]) for r in range(size)]
+
+
+class SearchStats:
+    """Opt-in search instrumentation, filled in when passed as stats=.
+
+    nodes counts search nodes expanded, backtracks the guesses undone and
+    max_depth the deepest branching level reached. depth_nodes,
+    depth_backtracks and depth_seconds are per-depth histograms (lists
+    indexed by depth), and branching[n] counts branch points whose cell
+    had n candidates. Searches only touch it behind "if stats is not None",
+    so leaving it out costs nothing.
+    """
+    __slots__ = ("nodes", "backtracks", "max_depth", "depth_nodes", "depth_backtracks",
+                 "depth_seconds", "branching", "_clock", "_depth")
+
+    def __init__(self):
+        self.nodes = 0
+        self.backtracks = 0
+        self.max_depth = 0
+        self.depth_nodes = []
+        self.depth_backtracks = []
+        self.depth_seconds = []
+        self.branching = []
+        self._clock = None
+        self._depth = 0
+
+    def __repr__(self):
+        return f"SearchStats(nodes={self.nodes}, backtracks={self.backtracks}, max_depth={self.max_depth})"
+
+    def enter(self, depth):
+        """Record a search node at depth."""
+        self.nodes += 1
+        self.max_depth = max(self.max_depth, depth)
+        _bump(self.depth_nodes, depth)
+        self._tick(depth)
+
+    def branch(self, candidates):
+        """Record a branch point over a cell with this many candidates."""
+        _bump(self.branching, candidates)
+
+    def backtrack(self, depth):
+        """Record a guess at depth being undone."""
+        self.backtracks += 1
+        _bump(self.depth_backtracks, depth)
+        self._tick(depth)
+
+    def finish(self):
+        """Charge the time since the last event to its depth; called when a solve ends."""
+        self._tick(self._depth)
+        self._clock = None
+
+    def _tick(self, depth):
+        # Time between two events is charged to the depth of the earlier one
+        now = time.perf_counter()
+        if self._clock is not None:
+            _bump(self.depth_seconds, self._depth, now - self._clock)
+        self._clock = now
+        self._depth = depth
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__ if not name.startswith("_")}
+
+    def to_json(self, **kwargs):
+        import json
+
+        return json.dumps(self.to_dict(), **kwargs)
+
+def _bump(histogram, index, amount=1):
+    if len(histogram) <= index:
+        histogram.extend([0] * (index + 1 - len(histogram)))
+    histogram[index] += amount
+
+
+def _search_naive(grid, empties, k, on_step, stats):
+    """Backtrack over empties in row-major order, trying digits in increasing order."""
+    if stats is not None:
+        stats.enter(k)
+    if k == len(empties):
+        return True
+    i = empties[k]
+    free = grid.candidates(i)
+    if stats is not None:
+        stats.branch(free.bit_count())
+    while free:
+        bit = free & -free
+        free ^= bit
+        num = bit.bit_length() - 1
+        grid.place(i, num)
+        if on_step is not None:
+            on_step(grid.position(i), num, "place")
+        if _search_naive(grid, empties, k + 1, on_step, stats):
+            return True
+        grid.remove(i)
+        if stats is not None:
+            stats.backtrack(k)
+        if on_step is not None:
+            on_step(grid.position(i), 0, "remove")
+    return False
+
+def _assign(grid, trail, i, num, on_step):
+    grid.place(i, num)
+    trail.append(i)
+    if on_step is not None:
+        on_step(grid.position(i), num, "place")
+
+def _undo(grid, trail, mark, on_step):
+    """Remove every placement made since the trail was mark entries long."""
+    while len(trail) > mark:
+        i = trail.pop()
+        grid.remove(i)
+        if on_step is not None:
+            on_step(grid.position(i), 0, "remove")
+
+def _propagate(grid, empties, trail, on_step):
+    """Fill naked and hidden singles until none are left, returning False on a contradiction."""
+    cells = grid.cells
+    rows, cols, boxes = grid.rows, grid.cols, grid.boxes
+    row_of, col_of, box_of = grid.row_of, grid.col_of, grid.box_of
+    all_digits = grid.all_digits
+    progress = True
+    while progress:
+        progress = False
+        # Naked singles: a cell with exactly one candidate
+        for i in empties:
+            if cells[i]:
+                continue
+            free = all_digits & ~(rows[row_of[i]] | cols[col_of[i]] | boxes[box_of[i]])
+            if not free:
+                return False
+            if not free & (free - 1):
+                _assign(grid, trail, i, free.bit_length() - 1, on_step)
+                progress = True
+        # Hidden singles: a digit with exactly one possible cell in a unit
+        for unit in grid.geo.units:
+            placed = once = twice = 0
+            for i in unit:
+                if cells[i]:
+                    placed |= 1 << cells[i]
+                else:
+                    free = all_digits & ~(rows[row_of[i]] | cols[col_of[i]] | boxes[box_of[i]])
+                    twice |= once & free
+                    once |= free
+            if all_digits & ~placed & ~once:
+                return False
+            singles = once & ~twice
+            if not singles:
+                continue
+            for i in unit:
+                if cells[i]:
+                    continue
+                free = grid.candidates(i) & singles
+                if free:
+                    _assign(grid, trail, i, free.bit_length() - 1, on_step)
+                    progress = True
+    return True
+
+def _branches(grid, empties):
+    """Return the (cell, digit) alternatives to branch on, or [] if the board is full.
+
+    That is the empty cell with the fewest candidates, unless it has more
+    than two and some unit has a digit left with only two possible cells,
+    which makes a smaller branch on large boards.
+    """
+    cells = grid.cells
+    best = None
+    best_count = grid.size + 1
+    for i in empties:
+        if cells[i]:
+            continue
+        count = grid.candidates(i).bit_count()
+        if count < best_count:
+            best, best_count = i, count
+            if count == 2:
+                break
+    if best is None:
+        return []
+    if best_count > 2:
+        for unit in grid.geo.units:
+            once = twice = more = 0
+            for i in unit:
+                if not cells[i]:
+                    free = grid.candidates(i)
+                    more |= twice & free
+                    twice |= once & free
+                    once |= free
+            pairs = twice & ~more
+            if pairs:
+                bit = pairs & -pairs
+                num = bit.bit_length() - 1
+                return [(i, num) for i in unit if not cells[i] and grid.candidates(i) & bit]
+    free = grid.candidates(best)
+    return [(best, num) for num in range(1, grid.size + 1) if free >> num & 1]
+
+def _search_mrv(grid, empties, trail, on_step, stats, depth=0):
+    """Propagate singles, then branch on the most constrained cell or digit placement."""
+    if stats is not None:
+        stats.enter(depth)
+    mark = len(trail)
+    if not _propagate(grid, empties, trail, on_step):
+        _undo(grid, trail, mark, on_step)
+        return False
+    branches = _branches(grid, empties)
+    if not branches:
+        return True
+    if stats is not None:
+        stats.branch(len(branches))
+    for i, num in branches:
+        _assign(grid, trail, i, num, on_step)
+        if _search_mrv(grid, empties, trail, on_step, stats, depth + 1):
+            return True
+        if stats is not None:
+            stats.backtrack(depth)
+        _undo(grid, trail, len(trail) - 1, on_step)
+    _undo(grid, trail, mark, on_step)
+    return False
+
+def _count_mrv(grid, empties, trail, limit, stats, depth=0):
+    """Count solutions below this node like _search_mrv, stopping once limit are found."""
+    if stats is not None:
+        stats.enter(depth)
+    mark = len(trail)
+    if not _propagate(grid, empties, trail, None):
+        _undo(grid, trail, mark, None)
+        return 0
+    branches = _branches(grid, empties)
+    if not branches:
+        _undo(grid, trail, mark, None)
+        return 1
+    if stats is not None:
+        stats.branch(len(branches))
+    found = 0
+    for i, num in branches:
+        _assign(grid, trail, i, num, None)
+        found += _count_mrv(grid, empties, trail, limit - found, stats, depth + 1)
+        _undo(grid, trail, len(trail) - 1, None)
+        if found >= limit:
+            break
+        if stats is not None:
+            stats.backtrack(depth)
+    _undo(grid, trail, mark, None)
+    return found
+
+def search_subtree(board, limit=1, poll=None, poll_every=256, on_solution=None):
+    """Iterative MRV search of board that can stop and hand back its unexplored part.
+
+    Returns (solutions, rest): up to limit solutions as flat bytearrays,
+    and rest, the untried branches as flat boards (shallowest first) if
+    the search was interrupted, else []. poll, if given, is called every
+    poll_every nodes; when it returns True the search stops there. Solving
+    every board in rest covers exactly the part of the tree not searched
+    yet, which is what lets parallel.py split and rebalance work. With
+    on_solution set no copies are kept: it is called with the grid's cells
+    at each solution, and solutions comes back as their number; the search
+    ends there, as at limit, if it returns True.
+    """
+    grid = Grid.load(board)
+    if grid is None:
+        return (0 if on_solution else []), []
+    empties = grid.empties()
+    trail = []
+    solutions = []
+    found = 0
+    # One [base, branches, next, mark] per branching node on the current path
+    frames = []
+    nodes = 0
+    while True:
+        mark = len(trail)
+        if _propagate(grid, empties, trail, None):
+            branches = _branches(grid, empties)
+            if branches:
+                frames.append([len(trail), branches, 0, mark])
+            else:
+                found += 1
+                stop = found >= limit
+                if on_solution:
+                    stop = on_solution(grid.cells) or stop
+                else:
+                    solutions.append(bytearray(grid.cells))
+                if stop:
+                    return (found if on_solution else solutions), []
+                _undo(grid, trail, mark, None)
+        else:
+            _undo(grid, trail, mark, None)
+        # Move to the next untried branch, popping exhausted nodes
+        while frames:
+            frame = frames[-1]
+            _undo(grid, trail, frame[0], None)
+            if frame[2] < len(frame[1]):
+                i, num = frame[1][frame[2]]
+                frame[2] += 1
+                _assign(grid, trail, i, num, None)
+                break
+            frames.pop()
+            _undo(grid, trail, frame[3], None)
+        else:
+            return (found if on_solution else solutions), []
+        nodes += 1
+        if poll is not None and nodes % poll_every == 0 and poll():
+            frames[-1][2] -= 1
+            _undo(grid, trail, frames[-1][0], None)
+            return (found if on_solution else solutions), _frontier(grid, trail, frames)
+
+def _frontier(grid, trail, frames):
+    """Flat boards for every untried branch in frames, shallowest first."""
+    cells = bytearray(grid.cells)
+    rest = []
+    end = len(trail)
+    for base, branches, tried, _ in reversed(frames):
+        for k in range(base, end):
+            cells[trail[k]] = 0
+        end = base
+        for i, num in reversed(branches[tried:]):
+            piece = bytearray(cells)
+            piece[i] = num
+            rest.append(piece)
+    rest.reverse()
+    return rest
+
+def _search_dlx(grid, on_step, stats):
+    """Take the first exact cover found by the Dancing Links backend."""
+    solution = dlx.solve(grid.to_board(), stats)
+    if solution is None:
+        return False
+    for i in grid.empties():
+        row, col = grid.position(i)
+        _assign(grid, [], i, solution[row][col], on_step)
+    return True
+
+# Callables hook(board, strategy) returning a context manager entered around each solve
+SOLVE_HOOKS = []
+
+@contextmanager
+def solve_hook(hook):
+    """Wrap every solve started inside the with block in hook(board, strategy).
+
+    This is how profilers and samplers attach to the solver, e.g.
+    with solve_hook(instrument.StackSampler()) as sampler: solve(board)
+    """
+    SOLVE_HOOKS.append(hook)
+    try:
+        yield hook
+    finally:
+        SOLVE_HOOKS.remove(hook)
+
+STRATEGIES = {
+    "naive": lambda grid, on_step, stats: _search_naive(grid, grid.empties(), 0, on_step, stats),
+    "mrv": lambda grid, on_step, stats: _search_mrv(grid, grid.empties(), [], on_step, stats),
+    "dlx": _search_dlx,
+}
+
+def solve_in_place(board, on_step=None, strategy="mrv", stats=None):
+    """Solve board in place without any GUI, returning True if a solution was found.
+
+    strategy picks the search order from STRATEGIES: "naive" walks cells in
+    row-major order like find_empty, "mrv" branches on the most constrained
+    cell and fills naked/hidden singles after every assignment, "dlx" runs
+    Algorithm X with Dancing Links (see dlx.py).
+    on_step, if given, is called as on_step(pos, num, action) after every
+    place/remove, with board already updated. stats, if given, is a
+    SearchStats that receives the search's counters and histograms.
+    Every hook registered with solve_hook() wraps the search.
+    """
+    search = STRATEGIES[strategy]
+    grid = Grid.load(board)
+    if grid is None:
+        return False
+    if on_step is not None:
+        step = on_step
+        write = _cell_writer(board, grid.size)
+
+        def on_step(pos, num, action):
+            write(pos, num)
+            step(pos, num, action)
+    if SOLVE_HOOKS:
+        with ExitStack() as hooks:
+            for hook in list(SOLVE_HOOKS):
+                hooks.enter_context(hook(board, strategy))
+            found = search(grid, on_step, stats)
+    else:
+        found = search(grid, on_step, stats)
+    if stats is not None:
+        stats.finish()
+    if not found:
+        return False
+    if isinstance(board[0], int):
+        for i, num in enumerate(grid.cells):
+            board[i] = num
+    else:
+        for row, solved in zip(board, grid.to_board()):
+            row[:] = solved
+    return True
+
+def count_solutions(board, limit=2, stats=None):
+    """Return how many solutions board has, counting no further than limit.
+
+    The default limit of 2 is enough to tell "none" (0), "unique" (1) and
+    "multiple" (2) apart, and the search stops as soon as it is reached,
+    so even an empty board answers at once. One Grid and trail are shared
+    by the whole search, and board itself is left untouched. Being a
+    plain module-level function it can be submitted to a process pool.
+    """
+    grid = Grid.load(board)
+    if grid is None or limit <= 0:
+        return 0
+    found = _count_mrv(grid, grid.empties(), [], limit, stats)
+    if stats is not None:
+        stats.finish()
+    return found
+
+def remove_given(grid, i):
+    """Clear cell i of grid if its puzzle stays uniquely solvable, returning whether it did.
+
+    grid must hold a puzzle with exactly one solution. Any second solution
+    after the removal would have to put another digit in cell i, so only
+    those alternatives are searched, each undone before the next; grid is
+    otherwise left as it was, ready for the next removal.
+    """
+    num = grid.cells[i]
+    grid.remove(i)
+    free = grid.candidates(i) & ~(1 << num)
+    empties = grid.empties()
+    while free:
+        bit = free & -free
+        free ^= bit
+        trail = []
+        _assign(grid, trail, i, bit.bit_length() - 1, None)
+        found = _search_mrv(grid, empties, trail, None, None)
+        _undo(grid, trail, 0, None)
+        if found:
+            grid.place(i, num)
+            return False
+    return True
+
+def _cell_writer(board, size):
+    """Return write(pos, num) that sets one cell of a nested or flat board."""
+    if isinstance(board[0], int):
+        def write(pos, num):
+            board[pos[0] * size + pos[1]] = num
+    else:
+        def write(pos, num):
+            board[pos[0]][pos[1]] = num
+    return write
+
+def solve(board, strategy="mrv", stats=None):
+    """Return a solved copy of board, or None if it has no solution.
+
+    A list of rows gives back a list of rows; a flat sequence gives back
+    a flat bytearray.
+    """
+    if isinstance(board[0], int):
+        solution = bytearray(board)
+    else:
+        solution = [row[:] for row in board]
+    return solution if solve_in_place(solution, strategy=strategy, stats=stats) else None
+
+def _steps_naive(grid, empties):
+    """Iterative _search_naive that yields (index, num, action) for every place/remove."""
+    if not empties:
+        return True
+    pending = [0] * len(empties)
+    pending[0] = grid.candidates(empties[0])
+    k = 0
+    while k >= 0:
+        i = empties[k]
+        if grid.cells[i]:
+            grid.remove(i)
+            yield i, 0, "remove"
+        free = pending[k]
+        if not free:
+            k -= 1
+            continue
+        bit = free & -free
+        pending[k] = free ^ bit
+        num = bit.bit_length() - 1
+        grid.place(i, num)
+        yield i, num, "place"
+        k += 1
+        if k == len(empties):
+            return True
+        pending[k] = grid.candidates(empties[k])
+    return False
+
+def iter_steps(board, strategy="naive"):
+    """Solve board in place as a generator of (pos, num, action) events.
+
+    Each event is yielded after board has been updated, so a caller can
+    pull a few steps per frame, pause by not pulling, and cancel with
+    close(). The generator returns True if a solution was found. The naive
+    search is resumable step by step; other strategies finish in
+    milliseconds, so their events are recorded first and then replayed.
+    """
+    grid = Grid.load(board)
+    if grid is None:
+        return False
+    write = _cell_writer(board, grid.size)
+    if strategy == "naive":
+        steps = _steps_naive(grid, grid.empties())
+        while True:
+            try:
+                i, num, action = next(steps)
+            except StopIteration as done:
+                return done.value
+            pos = grid.position(i)
+            write(pos, num)
+            yield pos, num, action
+    events = []
+    solved = STRATEGIES[strategy](grid, lambda *event: events.append(event), None)
+    for pos, num, action in events:
+        write(pos, num)
+        yield pos, num, action
+    return solved
+
 def solve_gui(board, screen, draw_func):
     """Solve the Sudoku board using backtracking, with GUI updates."""
-    find = find_empty(board)
-    if not find:
-        return True
-    row, col = find
-
-    for num in range(1, 10):
-        if is_valid(board, num, (row, col)):
-            board[row][col] = num
-            draw_func(screen, board, (row, col), num, "place")
-            pygame.display.update()
-            pygame.time.delay(40)
-
-            if solve_gui(board, screen, draw_func):
-                return True
-
-            board[row][col] = 0
-            draw_func(screen, board, (row, col), 0, "remove")
-            pygame.display.update()
-            pygame.time.delay(40)
-    return False
\ No newline at end of file
+    import pygame
+
+    def on_step(pos, num, action):
+        draw_func(screen, board, pos, num, action)
+        pygame.display.update()
+        pygame.time.delay(40)
+
+    return solve_in_place(board, on_step, strategy="naive")
@@ -0,0 +1,135 @@
+"""NumPy batch solving and validation for many 9x9 boards at once.
+
+Boards are stacked into an (N, 9, 9) uint8 array. Candidates, singles
+propagation and validity checks run as whole-array reductions over rows,
+columns and boxes; only the boards propagation cannot finish are handed to
+the per-board solver. Needs numpy (pip install numpy).
+"""
+import numpy as np
+
+from puzzles import board_from_string
+from solver import solve
+
+ALL_DIGITS = 0x3FE
+# Bit for each cell value (0 for blanks) and digit for each single-bit mask
+BIT_OF = np.array([0] + [1 << d for d in range(1, 10)], dtype=np.uint16)
+DIGIT_OF = np.zeros(ALL_DIGITS + 1, dtype=np.uint8)
+DIGIT_OF[BIT_OF[1:]] = np.arange(1, 10)
+
+
+def load_boards(boards):
+    """Stack boards (lists of lists or 81-character strings) into an (N, 9, 9) uint8 array.
+
+    Raises ValueError for any board that is not 9x9.
+    """
+    boards = [board_from_string(b) if isinstance(b, str) else b for b in boards]
+    for k, board in enumerate(boards):
+        if len(board) != 9 or any(len(row) != 9 for row in board):
+            raise ValueError(f"board {k} is not 9x9; the vectorized solver only handles 9x9 boards")
+    return np.array(boards, dtype=np.uint8).reshape(-1, 9, 9)
+
+def _units(a):
+    """Split an (N, 9, 9) array into its rows, columns and boxes, each (N, 9, 9)."""
+    boxes = a.reshape(-1, 3, 3, 3, 3).transpose(0, 1, 3, 2, 4).reshape(-1, 9, 9)
+    return a, a.transpose(0, 2, 1), boxes
+
+def _from_boxes(boxes):
+    """Inverse of the box split in _units."""
+    return boxes.reshape(-1, 3, 3, 3, 3).transpose(0, 1, 3, 2, 4).reshape(-1, 9, 9)
+
+def candidate_masks(grids):
+    """(N, 9, 9) uint16 candidate bitmasks, bit n set for digit n like solver.Grid.candidates."""
+    rows, cols, boxes = _units(BIT_OF[grids])
+    row_used = np.bitwise_or.reduce(rows, axis=2)
+    col_used = np.bitwise_or.reduce(cols, axis=2)
+    box_used = np.bitwise_or.reduce(boxes, axis=2).reshape(-1, 3, 1, 3, 1)
+    used = row_used[:, :, None] | col_used[:, None, :]
+    used |= np.broadcast_to(box_used, (len(grids), 3, 3, 3, 3)).reshape(-1, 9, 9)
+    masks = ALL_DIGITS & ~used
+    masks[grids != 0] = 0
+    return masks
+
+def candidates(grids):
+    """(N, 9, 9, 9) bool array, True where empty cell (r, c) can still take digit d + 1."""
+    return (candidate_masks(grids)[..., None] & BIT_OF[1:]) != 0
+
+def consistent(grids):
+    """(N,) bool array, True for boards with no digit repeated in a row, column or box."""
+    ok = np.ones(len(grids), dtype=bool)
+    for unit in _units(BIT_OF[grids]):
+        # Distinct powers of two sum to their OR, a repeat makes the sum larger
+        ok &= (unit.sum(axis=2, dtype=np.uint16) == np.bitwise_or.reduce(unit, axis=2)).all(axis=1)
+    return ok
+
+def is_valid_batch(grids, nums, rows, cols):
+    """Vectorized solver.is_valid: can nums[k] go at (rows[k], cols[k]) of board k?
+
+    nums, rows and cols are length-N arrays (or scalars), and like is_valid
+    the target cell itself is ignored.
+    """
+    n = len(grids)
+    index = np.arange(n)
+    nums, rows, cols = (np.broadcast_to(a, (n,)) for a in (nums, rows, cols))
+    hits = grids == nums[:, None, None]
+    hits[index, rows, cols] = False
+    in_row = hits[index, rows, :].any(axis=1)
+    in_col = hits[index, :, cols].any(axis=1)
+    box = hits.reshape(n, 3, 3, 3, 3)[index, rows // 3, :, cols // 3, :]
+    return ~(in_row | in_col | box.any(axis=(1, 2)))
+
+def _hidden_singles(masks, used):
+    """Per unit, the digits that fit exactly one cell, and whether a missing digit fits none."""
+    once = np.zeros(masks.shape[:2], dtype=np.uint16)
+    twice = np.zeros_like(once)
+    for k in range(9):
+        twice |= once & masks[:, :, k]
+        once |= masks[:, :, k]
+    missing = (ALL_DIGITS & ~(once | used)) != 0
+    return once & ~twice, missing.any(axis=1)
+
+def propagate(grids):
+    """Fill naked and hidden singles across the batch in place.
+
+    Each pass only works on the boards that changed in the previous one.
+    Returns an (N,) bool array marking boards found to be contradictory;
+    those keep whatever partial fill they had reached.
+    """
+    dead = ~consistent(grids)
+    active = np.flatnonzero(~dead)
+    while active.size:
+        sub = grids[active]
+        masks = candidate_masks(sub)
+        empty = sub == 0
+        stuck = (empty & (masks == 0)).any(axis=(1, 2))
+        # The only digit left for a cell, or a digit that fits one cell of a unit
+        place = np.where(masks & (masks - 1), 0, masks)
+        for k, (unit_masks, unit_cells) in enumerate(zip(_units(masks), _units(BIT_OF[sub]))):
+            singles, missing = _hidden_singles(unit_masks, np.bitwise_or.reduce(unit_cells, axis=2))
+            stuck |= missing
+            hits = unit_masks & singles[:, :, None]
+            place |= (hits, hits.transpose(0, 2, 1), _from_boxes(hits))[k]
+        # A cell forced to two different digits cannot be satisfied
+        stuck |= ((place & (place - 1)) != 0).any(axis=(1, 2))
+        place[stuck] = 0
+        sub += DIGIT_OF[place]
+        grids[active] = sub
+        stuck |= ~consistent(sub)
+        dead[active] = stuck
+        active = active[~stuck & (place != 0).any(axis=(1, 2))]
+    return dead
+
+def solve_batch(boards, strategy="mrv"):
+    """Solve a batch of boards, returning (solutions, solved).
+
+    solutions is an (N, 9, 9) uint8 array and solved an (N,) bool array;
+    unsolvable boards keep their partially propagated grid with solved False.
+    """
+    grids = load_boards(boards) if not isinstance(boards, np.ndarray) else boards.astype(np.uint8)
+    dead = propagate(grids)
+    solved = ~dead & (grids != 0).all(axis=(1, 2))
+    for k in np.flatnonzero(~dead & ~solved):
+        solution = solve(grids[k].tolist(), strategy)
+        if solution is not None:
+            grids[k] = solution
+            solved[k] = True
+    return grids, solved
@@ -0,0 +1,50 @@
+"""Canonical forms and the solution cache under random Sudoku symmetries."""
+import random
+
+import pytest
+
+from cache import SolutionCache, canonical_form, map_solution
+from puzzles import BENCHMARK_TIERS, board_from_string, get_example_board
+from solver import solve
+
+PUZZLES = [get_example_board()] + [board_from_string(p) for p in BENCHMARK_TIERS["easy"]]
+
+
+def shuffled(board, rng):
+    """board under a random transposition, band/stack and row/column order and digit relabeling."""
+    def order():
+        bands = rng.sample(range(3), 3)
+        return [3 * b + k for b in bands for k in rng.sample(range(3), 3)]
+    rows, cols = order(), order()
+    digits = [0] + rng.sample(range(1, 10), 9)
+    grid = [[digits[board[r][c]] for c in cols] for r in rows]
+    return [list(col) for col in zip(*grid)] if rng.random() < 0.5 else grid
+
+
+@pytest.mark.parametrize("index", range(len(PUZZLES)))
+def test_symmetric_boards_share_a_key(index):
+    rng = random.Random(index)
+    key = canonical_form(PUZZLES[index])[0]
+    for _ in range(10):
+        assert canonical_form(shuffled(PUZZLES[index], rng))[0] == key
+
+@pytest.mark.parametrize("index", range(len(PUZZLES)))
+def test_map_solution_solves_the_original(index):
+    rng = random.Random(index)
+    for _ in range(5):
+        board = shuffled(PUZZLES[index], rng)
+        key, transform = canonical_form(board)
+        assert map_solution(solve(board_from_string(key)), transform) == solve(board)
+
+def test_cache_hits_symmetric_boards():
+    rng = random.Random(0)
+    cache = SolutionCache()
+    boards = [shuffled(get_example_board(), rng) for _ in range(5)]
+    assert [cache.solve(board) for board in boards] == [solve(board) for board in boards]
+    assert (cache.misses, cache.hits) == (1, 4)
+
+def test_cache_rejects_other_sizes():
+    with pytest.raises(ValueError, match="9x9"):
+        SolutionCache().solve(get_example_board(16))
+    with pytest.raises(ValueError, match="9x9"):
+        canonical_form([row[:4] for row in get_example_board()[:4]])
@@ -0,0 +1,35 @@
+"""Dancing Links checked against the bitmask engine's counts and solutions."""
+import pytest
+
+from dlx import iter_solutions
+from puzzles import get_example_board
+from solver import count_solutions, search_subtree, solve
+
+
+def loose_board(blanks):
+    """The example board with its first blanks givens cleared."""
+    cells = [num for row in get_example_board() for num in row]
+    for i in [i for i, num in enumerate(cells) if num][:blanks]:
+        cells[i] = 0
+    return [cells[r * 9:(r + 1) * 9] for r in range(9)]
+
+
+@pytest.mark.parametrize("blanks", [0, 8, 10, 12])
+def test_count_solutions_matches_dlx(blanks):
+    board = loose_board(blanks)
+    solutions = list(iter_solutions(board))
+    assert count_solutions(board, 10**6) == len(solutions)
+    assert count_solutions(board) == min(len(solutions), 2)
+    flat = {bytes(num for row in solution for num in row) for solution in solutions}
+    assert flat == {bytes(solution) for solution in search_subtree(board, 10**6)[0]}
+
+def test_clashing_givens_have_no_cover():
+    board = get_example_board()
+    board[0][2] = 7
+    assert list(iter_solutions(board)) == []
+    assert count_solutions(board) == 0
+
+@pytest.mark.parametrize("size", [16, 25])
+def test_large_boards(size):
+    board = get_example_board(size)
+    assert next(iter_solutions(board)) == solve(board) == solve(board, "dlx")
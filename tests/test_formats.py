@@ -0,0 +1,80 @@
+"""Puzzle file formats: round trips through every writer and reader, and malformed files."""
+import pytest
+
+from formats import FORMATS, PuzzleFile, encode, read_puzzles, unflatten, write_puzzles
+from puzzles import BENCHMARK_TIERS, board_from_string, get_example_board
+from solver import board_cells
+
+NINES = [get_example_board()] + [board_from_string(p) for tier in BENCHMARK_TIERS.values() for p in tier]
+
+
+def write(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_round_trip(tmp_path, fmt):
+    path = tmp_path / f"corpus.{fmt}"
+    with open(path, "wb") as out:
+        assert write_puzzles(out, NINES, fmt) == len(NINES)
+    expected = [bytes(board_cells(board)) for board in NINES]
+    assert [bytes(cells) for cells in read_puzzles(str(path), fmt)] == expected
+    puzzles = PuzzleFile(str(path), fmt)
+    assert len(puzzles) == len(NINES)
+    assert bytes(puzzles[3]) == expected[3] and bytes(puzzles[-1]) == expected[-1]
+    assert unflatten(puzzles[0]) == NINES[0]
+
+@pytest.mark.parametrize("size", [16, 25])
+@pytest.mark.parametrize("fmt", ["line", "sdk", "packed"])
+def test_round_trip_large(tmp_path, fmt, size):
+    board = get_example_board(size)
+    path = write(tmp_path, "big", encode(board, fmt) * 2)
+    assert [unflatten(cells) for cells in read_puzzles(path, fmt, size)] == [board, board]
+
+def test_format_from_extension(tmp_path):
+    path = write(tmp_path, "one.bin", encode(NINES[0], "packed"))
+    assert PuzzleFile(path).format == "packed"
+    assert unflatten(PuzzleFile(path)[0]) == NINES[0]
+
+def test_text_comments_rules_and_blanks(tmp_path):
+    line = encode(NINES[0]).decode().strip()
+    rows = [line[r * 9:(r + 1) * 9] for r in range(9)]
+    ruled = "\n".join(" | ".join(" ".join(row[s:s + 3]) for s in (0, 3, 6)) + ("\n------+-------+------" if r in (2, 5) else "")
+                      for r, row in enumerate(rows))
+    path = write(tmp_path, "a.sdk", f"# a comment\n{ruled}\n\n{ruled}\n".encode())
+    assert [unflatten(cells) for cells in read_puzzles(path)] == [NINES[0]] * 2
+    path = write(tmp_path, "a.txt", f"# a comment\n\n{line.replace('.', '0')}\r\n  {line.lower()}\n".encode())
+    assert [unflatten(cells) for cells in read_puzzles(path)] == [NINES[0]] * 2
+
+def test_empty_file(tmp_path):
+    path = write(tmp_path, "empty.bin", b"")
+    assert len(PuzzleFile(path)) == 0 and list(read_puzzles(path)) == []
+
+
+@pytest.mark.parametrize("name, data, message", [
+    ("short.txt", encode(NINES[0]) + b"123\n", "line 2: expected 81, 256 or 625 characters, got 3"),
+    ("bad.txt", b"\n" + encode(NINES[0]).replace(b".", b"x", 1), "line 2: invalid character"),
+    ("big.txt", encode(NINES[0]).replace(b".", b"A", 1), "line 1: invalid character"),
+    ("row.sdk", b"123456789\n12345678\n", "line 2: expected 9 cells, got 8"),
+    ("cut.sdk", b"#\n" + encode(NINES[0], "sdk")[:30], "line 2: grid has only 3 of 9 rows"),
+    ("odd.bin", bytes(80), "80 bytes is not a whole number of 81-byte puzzles"),
+    ("high.bin", bytes(81) + bytes([10]) * 81, "puzzle 1 has a cell above 9"),
+    ("high.nib", bytes(40) + b"\xa0", "puzzle 0 has a cell above 9"),
+])
+def test_malformed_files(tmp_path, name, data, message):
+    path = write(tmp_path, name, data)
+    with pytest.raises(ValueError, match=message):
+        list(read_puzzles(path))
+
+def test_bad_arguments(tmp_path):
+    path = write(tmp_path, "one.bin", encode(NINES[0], "packed"))
+    with pytest.raises(ValueError, match="unknown format"):
+        PuzzleFile(path, "csv")
+    with pytest.raises(ValueError, match="only holds 9x9"):
+        PuzzleFile(path, "nibble", 16)
+    with pytest.raises(ValueError, match="only holds 9x9"):
+        encode(get_example_board(16), "nibble")
+    with pytest.raises(IndexError, match="out of range"):
+        PuzzleFile(path)[1]
@@ -0,0 +1,32 @@
+"""Parallel search and counting checked against the single-process search."""
+import pytest
+
+from parallel import count_parallel, solve_parallel
+from puzzles import get_example_board
+from solver import count_solutions, search_subtree, solve
+
+
+def loose_board(blanks=12):
+    """The example board with its first blanks givens cleared: 532 solutions for 12."""
+    cells = [num for row in get_example_board() for num in row]
+    for i in [i for i, num in enumerate(cells) if num][:blanks]:
+        cells[i] = 0
+    return cells
+
+
+def test_on_solution_counts_without_copies():
+    seen = []
+    found, rest = search_subtree(loose_board(), 10**6, on_solution=lambda cells: seen.append(bytes(cells)))
+    solutions, _ = search_subtree(loose_board(), 10**6)
+    assert found == len(seen) == len(solutions) == 532 and not rest
+    assert seen == [bytes(solution) for solution in solutions]
+
+def test_on_solution_can_stop_the_search():
+    assert search_subtree(loose_board(), 10**6, on_solution=lambda cells: True) == (1, [])
+
+@pytest.mark.parametrize("limit", [1, 2, 100, 532, 10**6])
+def test_count_parallel_matches_count_solutions(limit):
+    assert count_parallel(loose_board(), limit, 2) == count_solutions(loose_board(), limit)
+
+def test_solve_parallel():
+    assert solve_parallel(get_example_board(), 2) == solve(get_example_board())
@@ -0,0 +1,70 @@
+"""SolveService coalescing and the /solve body formats."""
+import asyncio
+import json
+import time
+
+import pytest
+
+from puzzles import BENCHMARK_TIERS, board_from_string, board_to_string, get_example_board
+from server import SolveService, parse_solve_request
+
+# Takes the naive strategy far longer than any timeout used here
+SLOW = board_to_string(board_from_string(BENCHMARK_TIERS["anti-backtracking"][0]))
+
+
+async def _late_request(service, delay, budget):
+    await asyncio.sleep(delay)
+    start = time.perf_counter()
+    try:
+        await service.solve(SLOW, "naive", budget)
+    except TimeoutError:
+        return time.perf_counter() - start
+    raise AssertionError("the slow puzzle was solved")
+
+async def _first_and_late(service, first_budget, delay, late_budget):
+    first = asyncio.ensure_future(service.solve(SLOW, "naive", first_budget))
+    waited = await _late_request(service, delay, late_budget)
+    with pytest.raises(TimeoutError):
+        await first
+    return waited
+
+
+def test_late_request_keeps_its_own_deadline():
+    service = SolveService(workers=2)
+    try:
+        # Same total budget, but the first job's alarm goes off 0.6 s into the late request's
+        waited = asyncio.run(_first_and_late(service, 1.0, 0.4, 1.0))
+        assert waited >= 0.95
+        assert service.counters["coalesced"] == 0
+    finally:
+        service.close()
+
+def test_request_ending_before_the_job_coalesces():
+    service = SolveService(workers=2)
+    try:
+        waited = asyncio.run(_first_and_late(service, 1.0, 0.4, 0.3))
+        assert waited < 0.6
+        assert service.counters["coalesced"] == 1
+    finally:
+        service.close()
+
+
+
+@pytest.mark.parametrize("body", [
+    {"board": get_example_board()},
+    {"puzzle": board_to_string(get_example_board())},
+    board_to_string(get_example_board()),
+    get_example_board(),
+])
+def test_solve_body_formats(body):
+    line = board_to_string(get_example_board())
+    assert parse_solve_request(json.dumps(body).encode()) == (line, "mrv", 5.0)
+
+def test_bare_puzzle_line():
+    line = board_to_string(get_example_board())
+    assert parse_solve_request(line.replace(".", "0").encode())[0] == line
+
+@pytest.mark.parametrize("body", [b'{"puzzle": 1', b'"123"', b"[[1, 2], [3]]", b'[[1, "2"], [3, 4]]', b"{}", b"7"])
+def test_malformed_bodies(body):
+    with pytest.raises(ValueError):
+        parse_solve_request(body)
@@ -0,0 +1,57 @@
+"""The solver engine checked against a plain backtracker built on is_valid and find_empty."""
+import pytest
+
+from puzzles import BENCHMARK_TIERS, board_from_string, get_example_board
+from solver import STRATEGIES, find_empty, is_valid, solve, solve_in_place
+
+PUZZLES = [get_example_board()] + [board_from_string(p) for p in BENCHMARK_TIERS["easy"]]
+
+
+def reference_solve(board, steps):
+    """The original recursive solve_gui without the GUI, recording every place/remove."""
+    find = find_empty(board)
+    if not find:
+        return True
+    row, col = find
+    for num in range(1, len(board) + 1):
+        if is_valid(board, num, (row, col)):
+            board[row][col] = num
+            steps.append(((row, col), num, "place"))
+            if reference_solve(board, steps):
+                return True
+            board[row][col] = 0
+            steps.append(((row, col), 0, "remove"))
+    return False
+
+def reference_solution(board):
+    board = [row[:] for row in board]
+    assert reference_solve(board, [])
+    return board
+
+
+@pytest.mark.parametrize("strategy", sorted(STRATEGIES))
+@pytest.mark.parametrize("index", range(len(PUZZLES)))
+def test_solutions_match_reference(strategy, index):
+    puzzle = PUZZLES[index]
+    expected = reference_solution(puzzle)
+    assert solve(puzzle, strategy) == expected
+    board = [row[:] for row in puzzle]
+    assert solve_in_place(board, strategy=strategy)
+    assert board == expected
+
+@pytest.mark.parametrize("index", range(len(PUZZLES)))
+def test_naive_steps_match_reference(index):
+    expected = []
+    reference_solve([row[:] for row in PUZZLES[index]], expected)
+    steps = []
+    board = [row[:] for row in PUZZLES[index]]
+    solve_in_place(board, lambda pos, num, action: steps.append((pos, num, action)), strategy="naive")
+    assert steps == expected
+
+@pytest.mark.parametrize("strategy", sorted(STRATEGIES))
+def test_clashing_givens(strategy):
+    board = get_example_board()
+    board[0][2] = 7  # row 0 already has a 7
+    assert not is_valid(board, 7, (0, 2))
+    assert solve(board, strategy) is None
+    assert solve_in_place([row[:] for row in board], strategy=strategy) is False